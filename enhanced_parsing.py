@@ -1,10 +1,119 @@
 import pandas as pd
-import re
+try:
+    # The regex package is a drop-in for re with a faster matcher on this pattern mix
+    import regex as re
+except ImportError:
+    import re
 import json
-from typing import Dict, List, Optional, Tuple
+import os
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
 import time
-from difflib import SequenceMatcher
 from datetime import datetime
+from collections import Counter
+from itertools import chain
+from multiprocessing import Pool
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# ASCII characters re's Unicode \s matches but Hyperscan's \s does not
+_ASCII_SEPARATORS = re.compile(r'[\x1c-\x1f]')
+
+class PatternSet:
+    """Regex list (case-insensitive by default) scanned in a single Hyperscan pass when available"""
+
+    def __init__(self, patterns: List[str], flags: int = re.IGNORECASE, fuse: bool = False):
+        self.patterns = [re.compile(p, flags) for p in patterns]
+        self.ignorecase = bool(flags & re.IGNORECASE)
+        # (index, pattern, literal): on the re path a pattern only runs when its literal is a substring
+        self.gated_patterns = [(index, pattern, _required_literal(p)) for index, (pattern, p) in enumerate(zip(self.patterns, patterns))]
+        # One alternation only pays off when no pattern has a literal prefix re could scan for
+        self.fused = re.compile('|'.join(f'(?:{p})' for p in patterns), flags) if fuse and patterns else None
+        self.database = None
+        self._local = threading.local()
+        if hyperscan is not None and patterns:
+            try:
+                database = hyperscan.Database()
+                database.compile(
+                    expressions=[p.encode() for p in patterns],
+                    ids=list(range(len(patterns))),
+                    flags=[(hyperscan.HS_FLAG_CASELESS if self.ignorecase else 0) | hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns),
+                )
+                self.database = database
+            except hyperscan.error:
+                # Constructs Hyperscan cannot compile (e.g. lookarounds) keep the re path
+                self.database = None
+
+    def __iter__(self):
+        return iter(self.patterns)
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def _scan(self, text: str) -> set:
+        """Ids of all patterns matching text, via Hyperscan"""
+        scratch = getattr(self._local, 'scratch', None)
+        if scratch is None:
+            # Scratch space is per thread; the parser may be shared (e.g. Streamlit's cache_resource)
+            scratch = self._local.scratch = hyperscan.Scratch(self.database)
+        hits = set()
+        self.database.scan(text.encode(), match_event_handler=lambda pid, start, end, flags, context: hits.add(pid), scratch=scratch)
+        return hits
+
+    def _use_database(self, text: str) -> bool:
+        """Whether Hyperscan gives the same verdict as re for text"""
+        # Hyperscan's \b, \s and case folding are ASCII-only, and even within ASCII its \s
+        # misses the \x1c-\x1f separators that re's Unicode \s matches, so such text stays on re
+        return self.database is not None and text.isascii() and _ASCII_SEPARATORS.search(text) is None
+
+    def _candidates(self, text: str) -> Iterator[Tuple[int, re.Pattern]]:
+        """(index, pattern) pairs that can match text, skipping patterns whose literal is absent"""
+        if self.ignorecase:
+            # Substring checks mirror IGNORECASE only for ASCII text (re also folds e.g. 'ſ' to 's')
+            if not text.isascii():
+                return enumerate(self.patterns)
+            text = text.lower()
+        return ((index, pattern) for index, pattern, literal in self.gated_patterns if not literal or literal in text)
+
+    def count_matches(self, text: str) -> int:
+        """Number of patterns that match text"""
+        if self._use_database(text):
+            return len(self._scan(text))
+        return sum(1 for _, p in self._candidates(text) if p.search(text))
+
+    def matches_any(self, text: str) -> bool:
+        """Whether any pattern matches text"""
+        if self._use_database(text):
+            return bool(self._scan(text))
+        if self.fused is not None:
+            return self.fused.search(text) is not None
+        return any(p.search(text) for _, p in self._candidates(text))
+
+    def first_match(self, text: str) -> Optional[int]:
+        """Index of the first pattern, in list order, that matches text"""
+        if self._use_database(text):
+            hits = self._scan(text)
+            return min(hits) if hits else None
+        for index, p in self._candidates(text):
+            if p.search(text):
+                return index
+        return None
+
+def _required_literal(pattern: str) -> str:
+    """Lowercase text every match of a simple word pattern must contain, or '' if the pattern is not that simple"""
+    pieces = re.split(r'\\s[*+]?', pattern.replace(r'\b', ''))
+    if not all(re.fullmatch(r'[a-z0-9 ]+', piece) for piece in pieces if piece):
+        return ''
+    return max(pieces, key=len)
 
 class EnhancedMessageParser:
     def __init__(self):
@@ -160,6 +269,9 @@ class EnhancedMessageParser:
             r'\bterminal\b', r'\bplatform\b', r'\bgate\b', r'\bcoach\b'
         ]
         
+        # Additional keywords that indicate transportation (plain substring checks)
+        self.transport_keywords = ['booking', 'confirmation', 'ticket', 'journey', 'travel']
+        
         # --- ENHANCED: Challan Message Indicators ---
         self.challan_indicators = [
             r'\bchallan\b',
@@ -195,6 +307,23 @@ class EnhancedMessageParser:
             r'\bsent\s*to\s*court\b',
             r'\bdisposal\s*as\s*per\s*law\b',
         ]
+        # Secondary challan indicators for is_challan_message (matched on lowercased text)
+        self.challan_secondary_patterns = [
+            r'reference\s*number.*payment',
+            r'challan.*receipt',
+            r'traffic.*payment',
+            r'violation.*amount',
+            r'issued\s*against',
+            r'online\s*lok\s*adalat',
+            r'sent\s*to\s*court',
+            r'court\s*for\s*disposal',
+        ]
+        
+        # --- Challan Scoring Keywords (plain substring checks) ---
+        self.challan_traffic_keywords = ['violation', 'traffic police', 'virtual court', 'actionable', 'disposal', 'issued against', 'found actionable']
+        self.challan_payment_keywords = ['payment', 'receipt', 'reference number', 'initiated', 'received', 'online lok adalat', 'sama.live']
+        self.challan_court_keywords = ['sent to court', 'court for disposal', 'disposal as per law']
+        self.challan_platform_keywords = ['ifms', 'mptreasury', 'successfully done', 'sama.live', 'online lok adalat']
         
         # --- ENHANCED: Challan Status Indicators ---
         self.challan_status_patterns = {
@@ -331,6 +460,9 @@ class EnhancedMessageParser:
             r'\b(?:special|festive|limited)\s*(?:offer|deal)\b'
         ]
         
+        # Additional keywords for EMI reminders and overdue scenarios (plain substring checks)
+        self.emi_reminder_keywords = ['pending', 'overdue', 'bounce', 'unpaid', 'not paid', 'dishonour', 'outstanding', 'due']
+        
         # --- NEW: EPF Contribution Patterns ---
         self.epf_indicators = [
             r'\bepf\b', r'\bepfo\b', r'\buan\b', r'provident\s*fund', r'accumulations'
@@ -363,6 +495,31 @@ class EnhancedMessageParser:
         r'\bexpect\s*delivery\b', r'\bdelivery\s*by\b', r'\bdelivery\s*date\b',
         r'\bpayment\s*on\s*delivery\b', r'\border\s*id\b', r'\bplaced\s*successfully\b'
     ]
+        # Strong delivery / order confirmation patterns (matched case-sensitively on lowercased text)
+        self.ecommerce_strong_patterns = [
+            # Existing delivery patterns
+            r'awb\s*\d+.*?(?:undelivered|delivered|failed)',
+            r'(?:your|the)\s*(?:order|package|item|shipment).*?(?:undelivered|delivered|failed)',
+            r'delivery\s*(?:manager|executive|agent|partner)',
+            r'call.*?delivery.*?\d{10}',
+            r'shipper\s*-\s*\w+',
+            
+            # NEW: Order confirmation patterns
+            r'cash\s*on\s*delivery\s*order.*?placed\s*successfully',  # COD order placed successfully
+            r'order.*?for\s*rs\.?\s*\d+.*?placed\s*successfully',    # order for Rs. X placed successfully
+            r'expect\s*delivery\s*by\s*\d+\s*[A-Za-z]+',             # expect delivery by date
+            r'order\s*id\s*\d+\s*for\s*rs',                          # Order ID X for Rs.
+            r'cod\s*order\s*.*?successfully',                        # COD order successfully
+        ]
+        # Auto-detection checks in parse_single_message (also matched case-sensitively on lowercased text)
+        self.otp_delivery_exclusion_patterns = [
+            r'awb\s*\d+.*?undelivered.*?call\s*delivery\s*manager',  # Very specific combination
+        ]
+        self.auto_ecommerce_strong_patterns = [
+            r'awb\s*\d+.*?undelivered',
+            r'call\s*delivery\s*manager',
+            r'shipper\s*-\s*\w+\s*express',
+        ]
         self.order_id_patterns = [
         # Existing patterns
         r'(?:tracking\s*id|order\s*no\.?|order|awb)\s*[:\s#]*([A-Z0-9]{8,25})\b',
@@ -432,6 +589,25 @@ class EnhancedMessageParser:
         'Myntra': [r'\bmyntra\b'],  # May already exist
         'AJIO': [r'\bajio\b'],  # May already exist
     }
+        # Order statuses are checked most specific first to avoid substring conflicts
+        # (determine_order_status): Most specific first, then less specific
+        self.order_status_priority = [
+            'order_confirmed',     # NEW: HIGHEST PRIORITY for order confirmations
+            'undelivered',         # High priority - check before "delivered"
+            'delivery_failed',     # High priority - specific failure
+            'delivery_attempted',  # High priority - attempt made but failed
+            'customer_unavailable', # High priority - customer not available
+            'address_issue',       # High priority - address problems
+            'payment_pending',     # High priority - payment issues
+            'delivery_rescheduled', # Medium priority - rescheduled delivery
+            'return_initiated',    # Medium priority - return process
+            'cancellation_initiated', # Medium priority - cancellation process  
+            'cancelled',           # Medium priority - cancelled orders
+            'delivered',           # Lower priority - check after undelivered
+            'out_for_delivery',    # Lower priority - in progress
+            'shipped',             # Lowest priority - dispatched
+        ]
+        
         self.order_status_patterns = {
         # All existing patterns remain the same...
         'delivered': [
@@ -546,6 +722,9 @@ class EnhancedMessageParser:
         ]
     }
 
+        # Order confirmation phrases for e-commerce scoring (plain substring checks)
+        self.order_confirmation_phrases = ['placed successfully', 'order confirmed', 'expect delivery']
+
         # --- NEW: E-COMMERCE ITEM & DATE PATTERNS ---
         self.item_name_patterns = [
         # PRIORITY: More specific patterns first, then generic ones
@@ -647,8 +826,9 @@ class EnhancedMessageParser:
             r'consumption\s*of\s*(\d+(?:\.\d+)?)\s*kwh',
             r'for\s*(\d+(?:\.\d+)?)\s*units',
             # NEW: Additional unit patterns
-            r'(\d+(?:\.\d+)?)\s*kwh\s*consumed',
-            r'(\d+(?:\.\d+)?)\s*units\s*consumed',
+            # (?<!\d): only try at the start of a digit run, avoiding quadratic backtracking on long digit runs
+            r'(?<!\d)(\d+(?:\.\d+)?)\s*kwh\s*consumed',
+            r'(?<!\d)(\d+(?:\.\d+)?)\s*units\s*consumed',
         ]
 
         self.electricity_consumer_number_patterns = [
@@ -724,6 +904,28 @@ class EnhancedMessageParser:
             r'\b(\d{4,8})\s*is\s*your\s*otp\s*from\b',
         ]
         
+        # OTP scoring keywords (plain substring checks)
+        self.otp_security_phrases = ["don't share", "do not share", "valid for", "expires"]
+        self.otp_keywords = ['otp', 'verification', 'code', 'login', 'register']
+        
+        # --- OTP Purpose, Expiry & Security Warning Patterns ---
+        self.purpose_patterns = {
+            'Registration': [r'\b(?:registration|sign\s*up)\b'],
+            'Login': [r'\bto\s*(?:login|log\s*in|sign\s*in)\b', r'\bfor\s*(?:login|log\s*in|sign\s*in)\b'],
+            'Verification': [r'\bto\s*(?:verify|verification)\b', r'\bfor\s*(?:verification|account\s*verification)\b'],
+            'Transaction': [r'\bto\s*(?:complete|authorize)\s*(?:transaction|payment)\b'],
+            'Payment': [r'for\s*payment'],
+        }
+        self.expiry_patterns = [
+            r'\bvalid\s*(?:for|within)\s*(\d+)\s*(minutes?|mins?|min)\b',
+            r'\bexpires?\s*in\s*(\d+)\s*(minutes?|mins?|min)\b',
+            # Same as (?:otp|code)\s*.*?valid...: whitespace may span line breaks before .*?, but without
+            # the overlapping \s* / .*? that backtracks quadratically on long whitespace runs
+            r'\b(?:otp|code)(?:[^\S\n]*\n)*.*?valid\s*(?:for|within)\s*(\d+)\s*(minutes?|mins?|min)\b',
+            r'\bis\s*valid\s*within\s*(\d+)\s*(min|minutes?)\b',
+        ]
+        self.security_warning_patterns = [r'\bdo\s*not\s*share\b', r'\bnever\s*share\b']
+        
         # --- FIXED: Company & Service Keywords for OTP ---
         self.company_patterns = {
             'Google': [r'\bgoogle\b'], 'Google Pay': [r'\bgoogle pay\b'],
@@ -770,38 +972,67 @@ class EnhancedMessageParser:
     def _compile_patterns(self):
         """Compile all regex patterns for better performance"""
         self.compiled_otp_patterns = [re.compile(p, re.IGNORECASE) for p in self.otp_patterns]
-        self.compiled_true_otp_patterns = [re.compile(p, re.IGNORECASE) for p in self.true_otp_patterns]
-        self.compiled_strong_exclusions = [re.compile(p, re.IGNORECASE) for p in self.strong_exclusion_patterns]
+        self.compiled_true_otp_patterns = PatternSet(self.true_otp_patterns)
+        # Every OTP pattern (and the fallback's 4-8 digit search) needs at least three digits in a row
+        self.compiled_otp_prefilter = re.compile(r'\d{3}')
+        # Separators allowed inside a matched code, deleted without a regex call
+        self.otp_separator_table = str.maketrans('', '', '- ')
+        self.compiled_otp_fallback_pattern = re.compile(r'\b\d{4,8}\b')
+        self.compiled_strong_exclusions = PatternSet(self.strong_exclusion_patterns)
+        self.compiled_expiry_patterns = [re.compile(p, re.IGNORECASE) for p in self.expiry_patterns]
+        self.compiled_security_warning_patterns = [re.compile(p, re.IGNORECASE) for p in self.security_warning_patterns]
+        # Literals every expiry / security warning pattern requires; same case folding, so rejects are exact
+        self.compiled_expiry_prefilter = re.compile(r'min', re.IGNORECASE)
+        self.compiled_security_warning_prefilter = re.compile(r'share', re.IGNORECASE)
+        self.compiled_purpose_patterns = {}
+        for purpose, patterns in self.purpose_patterns.items():
+            self.compiled_purpose_patterns[purpose] = re.compile('|'.join(f'(?:{p})' for p in patterns))
+        # Purposes are tried in dict order, i.e. the first matching pattern of the set wins
+        self.purpose_names = list(self.compiled_purpose_patterns)
+        self.compiled_purpose_set = PatternSet([p.pattern for p in self.compiled_purpose_patterns.values()], flags=0)
         # EMI pattern compilation
         self.compiled_emi_amount_patterns = [re.compile(p, re.IGNORECASE) for p in self.emi_amount_patterns]
         self.compiled_emi_due_date_patterns = [re.compile(p, re.IGNORECASE) for p in self.emi_due_date_patterns]
         self.compiled_account_number_patterns = [re.compile(p, re.IGNORECASE) for p in self.account_number_patterns]
-        self.compiled_emi_indicators = [re.compile(p, re.IGNORECASE) for p in self.emi_indicators]
-        self.compiled_emi_exclusions = [re.compile(p, re.IGNORECASE) for p in self.emi_exclusion_patterns]
+        self.compiled_emi_indicators = PatternSet(self.emi_indicators, fuse=True)
+        self.compiled_emi_exclusions = PatternSet(self.emi_exclusion_patterns)
         # Challan pattern compilation
         self.compiled_challan_number_patterns = [re.compile(p, re.IGNORECASE) for p in self.challan_number_patterns]
         self.compiled_vehicle_number_patterns = [re.compile(p, re.IGNORECASE) for p in self.vehicle_number_patterns]
         self.compiled_challan_fine_patterns = [re.compile(p, re.IGNORECASE) for p in self.challan_fine_patterns]
         self.compiled_payment_link_patterns = [re.compile(p, re.IGNORECASE) for p in self.payment_link_patterns]
-        self.compiled_challan_indicators = [re.compile(p, re.IGNORECASE) for p in self.challan_indicators]
+        self.compiled_challan_indicators = PatternSet(self.challan_indicators)
+        self.compiled_challan_secondary_patterns = PatternSet(self.challan_secondary_patterns, flags=0)
+        # Cheap pre-check: plates start with two letters then a digit, and every challan
+        # number the extractor accepts is a run of at least 8 letters/digits
+        self.compiled_challan_hint_pattern = re.compile(r'[A-Z]{2}\d|[A-Z0-9]{8}', re.IGNORECASE)
+        # Format validators for extracted PNR/challan/vehicle numbers
+        self.compiled_alnum_prefix_pattern = re.compile(r'^[A-Z0-9]+')
+        self.compiled_state_code_prefix_pattern = re.compile(r'^[A-Z]{2,6}[A-Z0-9]+')
+        self.compiled_vehicle_format_pattern = re.compile(r'^[A-Z]{2}\d{1,2}[A-Z]{1,3}\d{3,4}')
         # Transportation pattern compilation - SIMPLIFIED
         self.compiled_pnr_patterns = [re.compile(p, re.IGNORECASE) for p in self.pnr_patterns]
-        self.compiled_transportation_indicators = [re.compile(p, re.IGNORECASE) for p in self.transportation_indicators]
+        self.compiled_transportation_indicators = PatternSet(self.transportation_indicators)
        
         # NEW: EPF pattern compilation
-        self.compiled_epf_indicators = [re.compile(p, re.IGNORECASE) for p in self.epf_indicators]
+        self.compiled_epf_indicators = PatternSet(self.epf_indicators)
         self.compiled_uan_patterns = [re.compile(p, re.IGNORECASE) for p in self.uan_patterns]
         self.compiled_epf_amount_patterns = [re.compile(p, re.IGNORECASE) for p in self.epf_amount_patterns]
         self.compiled_available_balance_patterns = [re.compile(p, re.IGNORECASE) for p in self.available_balance_patterns]
 
         # --- NEW: E-commerce pattern compilation ---
-        self.compiled_ecommerce_indicators = [re.compile(p, re.IGNORECASE) for p in self.ecommerce_indicators]
+        self.compiled_ecommerce_indicators = PatternSet(self.ecommerce_indicators)
+        self.compiled_ecommerce_strong_patterns = PatternSet(self.ecommerce_strong_patterns, flags=0)
+        self.compiled_otp_delivery_exclusions = PatternSet(self.otp_delivery_exclusion_patterns, flags=0)
+        self.compiled_auto_ecommerce_strong_patterns = PatternSet(self.auto_ecommerce_strong_patterns, flags=0)
         self.compiled_order_id_patterns = [re.compile(p, re.IGNORECASE) for p in self.order_id_patterns]
         self.compiled_amount_to_be_paid_patterns = [re.compile(p, re.IGNORECASE) for p in self.amount_to_be_paid_patterns]
         self.compiled_cancellation_code_patterns = [re.compile(p, re.IGNORECASE) for p in self.cancellation_code_patterns]
         self.compiled_order_status_patterns = {}
         for status, patterns in self.order_status_patterns.items():
-            self.compiled_order_status_patterns[status] = [re.compile(p, re.IGNORECASE) for p in patterns]
+            self.compiled_order_status_patterns[status] = PatternSet(patterns)
+        self.order_status_checks = [(status, self.compiled_order_status_patterns[status])
+                                    for status in self.order_status_priority if status in self.compiled_order_status_patterns]
         self.compiled_ecommerce_platform_patterns = {}
         for platform, patterns in self.ecommerce_platform_patterns.items():
             self.compiled_ecommerce_platform_patterns[platform] = [re.compile(p, re.IGNORECASE) for p in patterns]
@@ -811,7 +1042,7 @@ class EnhancedMessageParser:
         self.compiled_delivery_date_patterns = [re.compile(p, re.IGNORECASE) for p in self.delivery_date_patterns]
         
         # --- NEW: Electricity pattern compilation ---
-        self.compiled_electricity_indicators = [re.compile(p, re.IGNORECASE) for p in self.electricity_indicators]
+        self.compiled_electricity_indicators = PatternSet(self.electricity_indicators)
         self.compiled_electricity_bill_amount_patterns = [re.compile(p, re.IGNORECASE) for p in self.electricity_bill_amount_patterns]
         self.compiled_electricity_due_date_patterns = [re.compile(p, re.IGNORECASE) for p in self.electricity_due_date_patterns]
         self.compiled_electricity_units_patterns = [re.compile(p, re.IGNORECASE) for p in self.electricity_units_patterns]
@@ -821,16 +1052,19 @@ class EnhancedMessageParser:
             self.compiled_electricity_provider_patterns[provider] = [re.compile(p, re.IGNORECASE) for p in patterns]
         self.compiled_electricity_status_patterns = {}
         for status, patterns in self.electricity_status_patterns.items():
-            self.compiled_electricity_status_patterns[status] = [re.compile(p, re.IGNORECASE) for p in patterns]
+            self.compiled_electricity_status_patterns[status] = PatternSet(patterns)
 
-        # Challan status patterns
+        # Challan status patterns - one alternation per status, so each status is a single search
         self.compiled_challan_status_patterns = {}
         for status, patterns in self.challan_status_patterns.items():
-            self.compiled_challan_status_patterns[status] = [re.compile(p, re.IGNORECASE) for p in patterns]
+            self.compiled_challan_status_patterns[status] = re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE)
         # Company patterns
         self.compiled_company_patterns = {}
         for company, patterns in self.company_patterns.items():
             self.compiled_company_patterns[company] = [re.compile(p, re.IGNORECASE) for p in patterns]
+        # All company patterns flattened in priority order; PatternSet skips those whose literal is absent
+        self.company_pattern_owners = [company for company, patterns in self.company_patterns.items() for _ in patterns]
+        self.compiled_company_set = PatternSet([p for patterns in self.company_patterns.values() for p in patterns])
         self.compiled_bank_patterns = {}
         for bank, patterns in self.bank_patterns.items():
             self.compiled_bank_patterns[bank] = [re.compile(p, re.IGNORECASE) for p in patterns]
@@ -841,6 +1075,8 @@ class EnhancedMessageParser:
 
     def clean_text(self, text: str) -> str:
         """Clean the input text"""
+        # CSV columns are filled with "" before parsing, so the pd.isna dispatch is only needed for other input
+        if type(text) is str: return text.strip()
         if pd.isna(text): return ""
         return str(text).strip()
 
@@ -848,11 +1084,10 @@ class EnhancedMessageParser:
 
     def extract_pnr_number(self, text: str) -> Optional[str]:
         """Extract PNR number from transportation messages"""
-        text_upper = text.upper()
         for pattern in self.compiled_pnr_patterns:
-            match = pattern.search(text_upper)
+            match = pattern.search(text)
             if match:
-                pnr = match.group(1)
+                pnr = match.group(1).upper()
                 # Validate PNR format
                 if self.is_valid_pnr(pnr):
                     return pnr
@@ -865,10 +1100,10 @@ class EnhancedMessageParser:
         if len(pnr) == 10 and pnr.isdigit():
             return True
         # Flight PNR: 6 alphanumeric characters
-        if len(pnr) == 6 and re.match(r'^[A-Z0-9]+', pnr):
+        if len(pnr) == 6 and self.compiled_alnum_prefix_pattern.match(pnr):
             return True
         # Bus PNR: Variable format (8-12 characters)
-        if 8 <= len(pnr) <= 12 and re.match(r'^[A-Z0-9]+', pnr):
+        if 8 <= len(pnr) <= 12 and self.compiled_alnum_prefix_pattern.match(pnr):
             return True
         return False
 
@@ -878,7 +1113,7 @@ class EnhancedMessageParser:
         combined_text = f"{text.lower()} {sender_name.lower()}"
         
         # Check for transportation indicators
-        transport_indicator_count = sum(1 for p in self.compiled_transportation_indicators if p.search(combined_text))
+        transport_indicator_count = self.compiled_transportation_indicators.count_matches(combined_text)
         score += transport_indicator_count * 8
         
         # Check if PNR is found (main indicator)
@@ -886,8 +1121,7 @@ class EnhancedMessageParser:
             score += 50  # Higher weight since PNR is the primary extraction
         
         # Additional keywords that indicate transportation
-        transport_keywords = ['booking', 'confirmation', 'ticket', 'journey', 'travel']
-        keyword_matches = sum(1 for keyword in transport_keywords if keyword in combined_text)
+        keyword_matches = sum(1 for keyword in self.transport_keywords if keyword in combined_text)
         score += keyword_matches * 5
         
         return max(0, min(100, score))
@@ -897,7 +1131,7 @@ class EnhancedMessageParser:
         combined_text = f"{text.lower()} {sender_name.lower()}"
         
         # Primary indicators
-        if any(p.search(combined_text) for p in self.compiled_transportation_indicators):
+        if self.compiled_transportation_indicators.matches_any(combined_text):
             return True
         
         # Check for PNR patterns
@@ -934,20 +1168,22 @@ class EnhancedMessageParser:
     def extract_otp_code(self, text: str) -> Optional[str]:
         """REVERTED: Original OTP code extraction without phone exclusions"""
         
+        if not self.compiled_otp_prefilter.search(text):
+            return None
+        
         # Try direct patterns first
         for pattern in self.compiled_otp_patterns:
             match = pattern.search(text)
             if match:
-                otp = re.sub(r'[- ]', '', match.group(1))
+                otp = match.group(1).translate(self.otp_separator_table)
                 # Validate OTP length and format
                 if 4 <= len(otp) <= 8 and otp.isdigit():
                     return otp
         
-        # Fallback to true OTP patterns
-        if any(p.search(text.lower()) for p in self.compiled_true_otp_patterns):
-            potential_otps = re.findall(r'\b\d{4,8}\b', text)
-            if potential_otps:
-                return potential_otps[0]
+        # Fallback to true OTP patterns, checked only when there is a candidate code to return
+        potential_otp = self.compiled_otp_fallback_pattern.search(text)
+        if potential_otp and self.compiled_true_otp_patterns.matches_any(text.lower()):
+            return potential_otp.group(0)
         return None
         
         # ENHANCED: Try direct OTP patterns with better validation
@@ -963,7 +1199,7 @@ class EnhancedMessageParser:
                     return otp
         
         # Fallback to true OTP patterns with same validation
-        if any(p.search(text.lower()) for p in self.compiled_true_otp_patterns):
+        if self.compiled_true_otp_patterns.matches_any(text.lower()):
             potential_otps = re.findall(r'\b\d{4,8}\b', text)
             for otp in potential_otps:
                 # Check if this potential OTP is actually a phone number
@@ -975,11 +1211,12 @@ class EnhancedMessageParser:
 
     def extract_company_name(self, text: str, sender_name: str = "") -> Optional[str]:
         """FIXED: Enhanced company name extraction"""
-        combined_text = f"{text.lower()} {sender_name.lower()}"
-        for company, patterns in self.compiled_company_patterns.items():
-            if any(p.search(combined_text) for p in patterns):
-                return company
-        return None
+        return self._match_company(f"{text.lower()} {sender_name.lower()}")
+
+    def _match_company(self, combined_text: str) -> Optional[str]:
+        """Company for already lowercased "text sender" string"""
+        index = self.compiled_company_set.first_match(combined_text)
+        return None if index is None else self.company_pattern_owners[index]
 
     def calculate_otp_confidence_score(self, text: str, sender_name: str = "") -> int:
         """FIXED: Enhanced confidence score calculation for OTP messages"""
@@ -988,7 +1225,7 @@ class EnhancedMessageParser:
         combined_text = f"{text_lower} {sender_name.lower()}"
         
         # FIXED: Check for strong exclusions first
-        if any(p.search(text_lower) for p in self.compiled_strong_exclusions):
+        if self.compiled_strong_exclusions.matches_any(text_lower):
             return 0
         
         # FIXED: Check for OTP code first (higher priority)
@@ -997,37 +1234,33 @@ class EnhancedMessageParser:
             score += 50
         
         # FIXED: Check for true OTP patterns
-        if any(p.search(combined_text) for p in self.compiled_true_otp_patterns):
+        if self.compiled_true_otp_patterns.matches_any(combined_text):
             score += 25
         
         # FIXED: Check for company name
-        if self.extract_company_name(text, sender_name):
+        if self._match_company(combined_text):
             score += 15
         
         # FIXED: Security and validity indicators
-        if any(phrase in text_lower for phrase in ["don't share", "do not share", "valid for", "expires"]):
+        if any(phrase in text_lower for phrase in self.otp_security_phrases):
             score += 10
         
         # FIXED: Additional OTP keywords
-        otp_keywords = ['otp', 'verification', 'code', 'login', 'register']
-        keyword_matches = sum(1 for keyword in otp_keywords if keyword in combined_text)
+        keyword_matches = sum(1 for keyword in self.otp_keywords if keyword in combined_text)
         score += keyword_matches * 5
         
         return max(0, min(100, score))
 
     def extract_expiry_time(self, text: str) -> Optional[Dict[str, str]]:
         """Enhanced expiry time information extraction"""
-        expiry_patterns = [
-            r'\bvalid\s*(?:for|within)\s*(\d+)\s*(minutes?|mins?|min)\b',
-            r'\bexpires?\s*in\s*(\d+)\s*(minutes?|mins?|min)\b',
-            r'\b(?:otp|code)\s*.*?valid\s*(?:for|within)\s*(\d+)\s*(minutes?|mins?|min)\b',
-            r'\bis\s*valid\s*within\s*(\d+)\s*(min|minutes?)\b',
-        ]
+        if not self.compiled_expiry_prefilter.search(text):
+            return None
         
-        for pattern in expiry_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in self.compiled_expiry_patterns:
+            match = pattern.search(text)
             if match:
-                duration = match.group(1)
+                # Few distinct durations occur, so share one string object per value across results
+                duration = sys.intern(match.group(1))
                 unit = match.group(2).lower()
                 
                 # Normalize unit display
@@ -1137,11 +1370,10 @@ class EnhancedMessageParser:
 
     def extract_account_number(self, text: str) -> Optional[str]:
         """FIXED: Enhanced account number extraction"""
-        text_upper = text.upper()
         for pattern in self.compiled_account_number_patterns:
-            match = pattern.search(text_upper)
+            match = pattern.search(text)
             if match:
-                account_num = match.group(1)
+                account_num = match.group(1).upper()
                 # Enhanced validation
                 if any(c.isdigit() for c in account_num) and 6 <= len(account_num) <= 20:
                     # Exclude common false positives
@@ -1156,11 +1388,11 @@ class EnhancedMessageParser:
         combined_text = f"{text_lower} {sender_name.lower()}"
         
         # Check for EMI promotion exclusions first
-        if any(p.search(text_lower) for p in self.compiled_emi_exclusions):
+        if self.compiled_emi_exclusions.matches_any(text_lower):
             return 0
         
         # Check for EMI indicators
-        emi_indicator_count = sum(1 for p in self.compiled_emi_indicators if p.search(combined_text))
+        emi_indicator_count = self.compiled_emi_indicators.count_matches(combined_text)
         score += emi_indicator_count * 20
         
         # Check if EMI amount is found
@@ -1180,8 +1412,7 @@ class EnhancedMessageParser:
             score += 15
         
         # Additional keywords for EMI reminders and overdue scenarios
-        reminder_keywords = ['pending', 'overdue', 'bounce', 'unpaid', 'not paid', 'dishonour', 'outstanding', 'due']
-        keyword_matches = sum(1 for keyword in reminder_keywords if keyword in text_lower)
+        keyword_matches = sum(1 for keyword in self.emi_reminder_keywords if keyword in text_lower)
         score += keyword_matches * 8
         
         return max(0, min(100, score))
@@ -1189,16 +1420,15 @@ class EnhancedMessageParser:
     def is_emi_message(self, text: str) -> bool:
         """Check if message contains EMI-related indicators"""
         text_lower = text.lower()
-        return any(p.search(text_lower) for p in self.compiled_emi_indicators)
+        return self.compiled_emi_indicators.matches_any(text_lower)
 
     # --- ENHANCED: TRAFFIC CHALLAN PARSING METHODS ---
     def extract_challan_number(self, text: str) -> Optional[str]:
         """Enhanced challan number extraction"""
-        text_upper = text.upper()
         for pattern in self.compiled_challan_number_patterns:
-            match = pattern.search(text_upper)
+            match = pattern.search(text)
             if match:
-                challan_num = match.group(1)
+                challan_num = match.group(1).upper()
                 if self.is_valid_challan_number(challan_num):
                     return challan_num
         return None
@@ -1220,15 +1450,15 @@ class EnhancedMessageParser:
             return True
         
         # Payment reference numbers
-        if 8 <= len(challan_num) <= 12 and re.match(r'^[A-Z0-9]+', challan_num):
+        if 8 <= len(challan_num) <= 12 and self.compiled_alnum_prefix_pattern.match(challan_num):
             return True
         
         # State + alphanumeric formats
-        if len(challan_num) >= 10 and re.match(r'^[A-Z]{2,6}[A-Z0-9]+', challan_num):
+        if len(challan_num) >= 10 and self.compiled_state_code_prefix_pattern.match(challan_num):
             return True
         
         # Generic alphanumeric format
-        if len(challan_num) >= 8 and re.match(r'^[A-Z0-9]+', challan_num):
+        if len(challan_num) >= 8 and self.compiled_alnum_prefix_pattern.match(challan_num):
             has_letters = any(c.isalpha() for c in challan_num)
             has_numbers = any(c.isdigit() for c in challan_num)
             return has_letters and has_numbers
@@ -1237,11 +1467,10 @@ class EnhancedMessageParser:
 
     def extract_vehicle_number(self, text: str) -> Optional[str]:
         """Enhanced vehicle number extraction"""
-        text_upper = text.upper()
         for pattern in self.compiled_vehicle_number_patterns:
-            match = pattern.search(text_upper)
+            match = pattern.search(text)
             if match:
-                vehicle_num = match.group(1)
+                vehicle_num = match.group(1).upper()
                 if self.is_valid_vehicle_number(vehicle_num):
                     return vehicle_num
         return None
@@ -1250,12 +1479,8 @@ class EnhancedMessageParser:
         """Enhanced validation for Indian vehicle number format"""
         vehicle_num = vehicle_num.replace(' ', '').upper()
         
-        # Indian vehicle number formats
-        patterns = [
-            r'^[A-Z]{2}\d{1,2}[A-Z]{1,2}\d{4}',  # Standard format
-            r'^[A-Z]{2}\d{1,2}[A-Z]{1,3}\d{3,4}',  # Alternative format
-        ]
-        return any(re.match(pattern, vehicle_num) for pattern in patterns)
+        # Indian vehicle number formats (the alternative format also covers the standard one)
+        return self.compiled_vehicle_format_pattern.match(vehicle_num) is not None
 
     def extract_challan_fine_amount(self, text: str) -> Optional[str]:
         """Enhanced fine amount extraction"""
@@ -1277,9 +1502,8 @@ class EnhancedMessageParser:
             match = pattern.search(text)
             if match:
                 link = match.group(1) if match.group(1) and match.group(1).startswith('http') else match.group(0)
-                # Clean the link of any trailing punctuation
-                link = re.sub(r'[.,;)\]}\s]*$', '', link)
-                return link
+                # Clean the link of any trailing punctuation (links never contain whitespace)
+                return link.rstrip('.,;)]}')
         return None
 
     def extract_traffic_authority(self, text: str, sender_name: str = "") -> Optional[str]:
@@ -1292,28 +1516,12 @@ class EnhancedMessageParser:
 
     def determine_challan_status(self, text: str) -> str:
         """Enhanced challan status determination"""
-        text_lower = text.lower()
-        
-        # Check for court disposal first
-        for pattern in self.compiled_challan_status_patterns['court_disposal']:
-            if pattern.search(text_lower):
-                return 'court_disposal'
-        
-        # Check for payment completion status
-        for pattern in self.compiled_challan_status_patterns['paid']:
-            if pattern.search(text_lower):
-                return 'paid'
-        
-        # Check for pending payment indicators
-        for pattern in self.compiled_challan_status_patterns['pending']:
-            if pattern.search(text_lower):
-                return 'pending'
-        
-        # Check for issued status indicators
-        for pattern in self.compiled_challan_status_patterns['issued']:
-            if pattern.search(text_lower):
-                return 'issued'
+        # Checked in priority order: court disposal, payment completion, pending payment
+        for status in ('court_disposal', 'paid', 'pending'):
+            if self.compiled_challan_status_patterns[status].search(text):
+                return status
         
+        # Issued indicators and the fallback both resolve to 'issued'
         return 'issued'
 
     def calculate_challan_confidence_score(self, text: str, sender_name: str = "") -> int:
@@ -1323,7 +1531,7 @@ class EnhancedMessageParser:
         combined_text = f"{text_lower} {sender_name.lower()}"
         
         # Check for challan indicators
-        challan_indicator_count = sum(1 for p in self.compiled_challan_indicators if p.search(combined_text))
+        challan_indicator_count = self.compiled_challan_indicators.count_matches(combined_text)
         score += challan_indicator_count * 12
         
         # Check if challan number is found
@@ -1347,20 +1555,16 @@ class EnhancedMessageParser:
             score += 15
         
         # Enhanced keywords for different message types
-        traffic_keywords = ['violation', 'traffic police', 'virtual court', 'actionable', 'disposal', 'issued against', 'found actionable']
-        payment_keywords = ['payment', 'receipt', 'reference number', 'initiated', 'received', 'online lok adalat', 'sama.live']
-        court_keywords = ['sent to court', 'court for disposal', 'disposal as per law']
-        
-        traffic_matches = sum(1 for keyword in traffic_keywords if keyword in text_lower)
-        payment_matches = sum(1 for keyword in payment_keywords if keyword in text_lower)
-        court_matches = sum(1 for keyword in court_keywords if keyword in text_lower)
+        traffic_matches = sum(1 for keyword in self.challan_traffic_keywords if keyword in text_lower)
+        payment_matches = sum(1 for keyword in self.challan_payment_keywords if keyword in text_lower)
+        court_matches = sum(1 for keyword in self.challan_court_keywords if keyword in text_lower)
         
         score += traffic_matches * 8
         score += payment_matches * 8
         score += court_matches * 10  # Higher weight for court disposal
         
         # Boost score for specific platforms
-        if any(keyword in text_lower for keyword in ['ifms', 'mptreasury', 'successfully done', 'sama.live', 'online lok adalat']):
+        if any(keyword in text_lower for keyword in self.challan_platform_keywords):
             score += 15
         
         return max(0, min(100, score))
@@ -1370,21 +1574,11 @@ class EnhancedMessageParser:
         text_lower = text.lower()
         
         # Primary indicators
-        if any(p.search(text_lower) for p in self.compiled_challan_indicators):
+        if self.compiled_challan_indicators.matches_any(text_lower):
             return True
         
         # Secondary indicators
-        secondary_patterns = [
-            r'reference\s*number.*payment',
-            r'challan.*receipt',
-            r'traffic.*payment',
-            r'violation.*amount',
-            r'issued\s*against',
-            r'online\s*lok\s*adalat',
-            r'sent\s*to\s*court',
-            r'court\s*for\s*disposal',
-        ]
-        return any(re.search(pattern, text_lower) for pattern in secondary_patterns)
+        return self.compiled_challan_secondary_patterns.matches_any(text_lower)
 
     def parse_challan_message(self, message: str, sender_name: str = "") -> Dict:
         """Enhanced challan information parsing"""
@@ -1499,7 +1693,7 @@ class EnhancedMessageParser:
         combined_text = f"{text_lower} {sender_name.lower()}"
         
         # Check for strong indicators
-        epf_indicator_count = sum(1 for p in self.compiled_epf_indicators if p.search(combined_text))
+        epf_indicator_count = self.compiled_epf_indicators.count_matches(combined_text)
         score += epf_indicator_count * 25
         
         # Check if UAN is found (very strong indicator)
@@ -1665,31 +1859,10 @@ class EnhancedMessageParser:
         """ENHANCED: Determine the order status with proper priority including order confirmations"""
         text_lower = text.lower()
         
-        # CRITICAL: Check most specific patterns first to avoid substring conflicts
-        # Priority order: Most specific first, then less specific
-        priority_order = [
-            'order_confirmed',     # NEW: HIGHEST PRIORITY for order confirmations
-            'undelivered',         # High priority - check before "delivered"
-            'delivery_failed',     # High priority - specific failure
-            'delivery_attempted',  # High priority - attempt made but failed
-            'customer_unavailable', # High priority - customer not available
-            'address_issue',       # High priority - address problems
-            'payment_pending',     # High priority - payment issues
-            'delivery_rescheduled', # Medium priority - rescheduled delivery
-            'return_initiated',    # Medium priority - return process
-            'cancellation_initiated', # Medium priority - cancellation process  
-            'cancelled',           # Medium priority - cancelled orders
-            'delivered',           # Lower priority - check after undelivered
-            'out_for_delivery',    # Lower priority - in progress
-            'shipped',             # Lowest priority - dispatched
-        ]
-        
         # Check each status in priority order
-        for status in priority_order:
-            if status in self.compiled_order_status_patterns:
-                patterns = self.compiled_order_status_patterns[status]
-                if any(p.search(text_lower) for p in patterns):
-                    return status
+        for status, patterns in self.order_status_checks:
+            if patterns.matches_any(text_lower):
+                return status
         
         # Default fallback
         return 'update'
@@ -1701,28 +1874,11 @@ class EnhancedMessageParser:
         combined_text = f"{text_lower} {sender_name.lower()}"
 
         # Check for general e-commerce indicators
-        indicator_count = sum(1 for p in self.compiled_ecommerce_indicators if p.search(combined_text))
+        indicator_count = self.compiled_ecommerce_indicators.count_matches(combined_text)
         score += indicator_count * 8
 
         # ENHANCED: Strong boost for specific delivery AND order confirmation patterns
-        strong_patterns = [
-            # Existing delivery patterns
-            r'awb\s*\d+.*?(?:undelivered|delivered|failed)',
-            r'(?:your|the)\s*(?:order|package|item|shipment).*?(?:undelivered|delivered|failed)',
-            r'delivery\s*(?:manager|executive|agent|partner)',
-            r'call.*?delivery.*?\d{10}',
-            r'shipper\s*-\s*\w+',
-            
-            # NEW: Order confirmation patterns
-            r'cash\s*on\s*delivery\s*order.*?placed\s*successfully',  # COD order placed successfully
-            r'order.*?for\s*rs\.?\s*\d+.*?placed\s*successfully',    # order for Rs. X placed successfully
-            r'expect\s*delivery\s*by\s*\d+\s*[A-Za-z]+',             # expect delivery by date
-            r'order\s*id\s*\d+\s*for\s*rs',                          # Order ID X for Rs.
-            r'cod\s*order\s*.*?successfully',                        # COD order successfully
-        ]
-        
-        strong_pattern_matches = sum(1 for pattern in strong_patterns 
-                                    if re.search(pattern, text_lower))
+        strong_pattern_matches = self.compiled_ecommerce_strong_patterns.count_matches(text_lower)
         score += strong_pattern_matches * 25
 
         # Strong boost for finding an Order ID/AWB
@@ -1749,7 +1905,7 @@ class EnhancedMessageParser:
             score += 8
         
         # NEW: Special boost for order confirmation indicators
-        if any(phrase in text_lower for phrase in ['placed successfully', 'order confirmed', 'expect delivery']):
+        if any(phrase in text_lower for phrase in self.order_confirmation_phrases):
             score += 15
             
         return max(0, min(100, score))
@@ -1821,7 +1977,7 @@ class EnhancedMessageParser:
             if match:
                 return match.group(1)
         # Fallback for numbers in parentheses in a confirmed electricity message
-        if any(p.search(text.lower()) for p in self.compiled_electricity_indicators):
+        if self.compiled_electricity_indicators.matches_any(text.lower()):
             match = re.search(r'\(\s*([A-Z0-9]{8,20})\s*\)', text)
             if match:
                 return match.group(1)
@@ -1838,13 +1994,13 @@ class EnhancedMessageParser:
     def determine_electricity_bill_status(self, text: str) -> str:
         """Determine the status of the electricity bill."""
         text_lower = text.lower()
-        if any(p.search(text_lower) for p in self.compiled_electricity_status_patterns['paid']):
+        if self.compiled_electricity_status_patterns['paid'].matches_any(text_lower):
             return 'paid'
-        if 'payment_failed' in self.compiled_electricity_status_patterns and any(p.search(text_lower) for p in self.compiled_electricity_status_patterns['payment_failed']):
+        if 'payment_failed' in self.compiled_electricity_status_patterns and self.compiled_electricity_status_patterns['payment_failed'].matches_any(text_lower):
             return 'payment_failed'
-        if any(p.search(text_lower) for p in self.compiled_electricity_status_patterns['due']):
+        if self.compiled_electricity_status_patterns['due'].matches_any(text_lower):
             return 'due'
-        if any(p.search(text_lower) for p in self.compiled_electricity_status_patterns['generated']):
+        if self.compiled_electricity_status_patterns['generated'].matches_any(text_lower):
             return 'generated'
         return 'unknown'
 
@@ -1855,7 +2011,7 @@ class EnhancedMessageParser:
         combined_text = f"{text_lower} {sender_name.lower()}"
 
         # Strong boost for primary indicators
-        indicator_count = sum(1 for p in self.compiled_electricity_indicators if p.search(combined_text))
+        indicator_count = self.compiled_electricity_indicators.count_matches(combined_text)
         score += indicator_count * 15
 
         # Score based on extracted entities
@@ -1906,24 +2062,23 @@ class EnhancedMessageParser:
         clean_message = self.clean_text(message)
         
         if message_type == "auto":
+            message_lower = clean_message.lower()
             
             # PRIORITY 1: Check for OTP FIRST (restore original priority)
-            otp_score = self.calculate_otp_confidence_score(clean_message, sender_name)
+            # An extracted code is required, so the cheaper extraction runs first and
+            # messages without one skip the confidence scoring entirely
             extracted_otp = self.extract_otp_code(clean_message)
-            
-            # Only check for very specific delivery exclusions, not general ones
-            very_specific_delivery_patterns = [
-                r'awb\s*\d+.*?undelivered.*?call\s*delivery\s*manager',  # Very specific combination
-            ]
-            
-            has_very_specific_delivery = any(
-                re.search(pattern, clean_message.lower()) 
-                for pattern in very_specific_delivery_patterns
-            )
-            
-            # If we have a clear OTP and no very specific delivery context, parse as OTP
-            if otp_score >= 50 and extracted_otp and not has_very_specific_delivery:
-                return self.parse_otp_message(message, sender_name)
+            if extracted_otp:
+                # An extracted code is enough for calculate_otp_confidence_score to reach 50,
+                # so only its strong exclusions can stop the message from parsing as OTP
+                strong_excluded = self.compiled_strong_exclusions.matches_any(message_lower)
+                
+                # Only check for very specific delivery exclusions, not general ones
+                has_very_specific_delivery = self.compiled_otp_delivery_exclusions.matches_any(message_lower)
+                
+                # If we have a clear OTP and no very specific delivery context, parse as OTP
+                if not strong_excluded and not has_very_specific_delivery:
+                    return self.parse_otp_message(message, sender_name)
 
             # PRIORITY 2: Check for EPF (EPFO/UAN are strong indicators)
             epf_score = self.calculate_epf_confidence_score(clean_message, sender_name)
@@ -1941,33 +2096,26 @@ class EnhancedMessageParser:
 
             # PRIORITY 5: Check for e-commerce only with strong indicators
             ecommerce_score = self.calculate_ecommerce_confidence_score(clean_message, sender_name)
-            strong_ecommerce_patterns = [
-                r'awb\s*\d+.*?undelivered',  
-                r'call\s*delivery\s*manager',  
-                r'shipper\s*-\s*\w+\s*express',  
-            ]
-            
-            has_strong_ecommerce_indicators = any(
-                re.search(pattern, clean_message.lower()) 
-                for pattern in strong_ecommerce_patterns
-            )
             
-            if has_strong_ecommerce_indicators and ecommerce_score >= 50:  # Higher threshold
+            # Higher threshold; the strong indicators are only searched for once it is met
+            if ecommerce_score >= 50 and self.compiled_auto_ecommerce_strong_patterns.matches_any(message_lower):
                 return self.parse_ecommerce_message(message, sender_name)
             
             # Count specific indicators for remaining types
-            challan_indicators = sum(1 for p in self.compiled_challan_indicators if p.search(clean_message.lower()))
-            emi_indicators = sum(1 for p in self.compiled_emi_indicators if p.search(clean_message.lower()))
-            transport_indicators = sum(1 for p in self.compiled_transportation_indicators if p.search(clean_message.lower()))
+            challan_indicators = self.compiled_challan_indicators.count_matches(message_lower)
+            emi_indicators = self.compiled_emi_indicators.count_matches(message_lower)
+            transport_indicators = self.compiled_transportation_indicators.count_matches(message_lower)
             
             # Check for specific patterns that are strong indicators
+            # Only run the challan/vehicle extractors when the message has a number shaped like one
             if (challan_indicators > 0 or 
-                self.extract_challan_number(clean_message) or 
-                self.extract_vehicle_number(clean_message)):
+                (self.compiled_challan_hint_pattern.search(clean_message) and
+                 (self.extract_challan_number(clean_message) or 
+                  self.extract_vehicle_number(clean_message)))):
                 return self.parse_challan_message(message, sender_name)
             
             if (emi_indicators > 0 and 
-                not any(p.search(clean_message.lower()) for p in self.compiled_emi_exclusions)):
+                not self.compiled_emi_exclusions.matches_any(message_lower)):
                 return self.parse_emi_message(message, sender_name)
             
             if transport_indicators > 0:
@@ -1998,6 +2146,11 @@ class EnhancedMessageParser:
         else:
             return {'status': 'error', 'reason': 'Invalid message type specified'}
 
+    def parse_many(self, items: List[Tuple[str, str]], message_type: str = "auto") -> List[Dict]:
+        """Parse a batch of (message, sender_name) pairs, returning results in input order"""
+        parse_single_message = self.parse_single_message
+        return [parse_single_message(message, sender, message_type) for message, sender in items]
+
     def parse_otp_message(self, message: str, sender_name: str = "") -> Dict:
         """FIXED: Enhanced OTP information parsing"""
         clean_message = self.clean_text(message)
@@ -2013,7 +2166,7 @@ class EnhancedMessageParser:
                     'confidence_score': confidence_score,
                     'otp_code': otp_code,
                     'company_name': self.extract_company_name(clean_message, sender_name),
-                    'purpose': self.extract_purpose(clean_message),
+                    'purpose': self.extract_purpose(clean_message.lower()),
                     'expiry_info': self.extract_expiry_time(clean_message),
                     'security_warnings': self.extract_security_warnings(clean_message),
                     'raw_message': message,
@@ -2029,41 +2182,57 @@ class EnhancedMessageParser:
         }
 
     # --- EXISTING OTP HELPER METHODS ---
-    def extract_purpose(self, text: str) -> Optional[str]:
-        """Extract purpose of OTP"""
-        purpose_patterns = {
-            'Registration': [r'\b(?:registration|sign\s*up)\b'],
-            'Login': [r'\bto\s*(?:login|log\s*in|sign\s*in)\b', r'\bfor\s*(?:login|log\s*in|sign\s*in)\b'],
-            'Verification': [r'\bto\s*(?:verify|verification)\b', r'\bfor\s*(?:verification|account\s*verification)\b'],
-            'Transaction': [r'\bto\s*(?:complete|authorize)\s*(?:transaction|payment)\b'],
-            'Payment': [r'for\s*payment'],
-        }
-        text_lower = text.lower()
-        for purpose, patterns in purpose_patterns.items():
-            if any(re.search(p, text_lower) for p in patterns):
-                return purpose
-        return None
+    def extract_purpose(self, text_lower: str) -> Optional[str]:
+        """Extract purpose of OTP from already lowercased text"""
+        index = self.compiled_purpose_set.first_match(text_lower)
+        return None if index is None else self.purpose_names[index]
 
     def extract_security_warnings(self, text: str) -> List[str]:
         """Extract security warnings"""
-        security_patterns = [r'\bdo\s*not\s*share\b', r'\bnever\s*share\b']
         warnings = []
-        for pattern in security_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        if not self.compiled_security_warning_prefilter.search(text):
+            return warnings
+        
+        for pattern in self.compiled_security_warning_patterns:
+            match = pattern.search(text)
             if match:
-                warnings.append(match.group(0))
+                # Only a handful of phrasings occur; interning avoids a fresh copy per message
+                warnings.append(sys.intern(match.group(0)))
         return warnings
 
     # --- REMAINING METHODS (process_csv_file, summary stats, etc.) ---
-    def process_csv_file(self, input_file: str, output_file: str = None, message_type: str = "auto") -> Dict:
-        """Process CSV file for all message types"""
+    def _expand_duplicate_results(self, rows: List[Tuple[str, str]], row_counts: Counter, unique_results) -> Iterator[Dict]:
+        """Yield one result per row, given results for the distinct rows in first-occurrence order"""
+        unique_results = iter(unique_results)
+        pending = {}
+        for row in rows:
+            result = pending.pop(row) if row in pending else next(unique_results)
+            row_counts[row] -= 1
+            if row_counts[row]:
+                # Later repeats still need this result; hand out a copy since callers annotate it
+                pending[row] = result
+                yield dict(result)
+            else:
+                yield result
+
+    def process_csv_file(self, input_file: str, output_file: str = None, message_type: str = "auto", workers: Optional[int] = 1) -> Dict:
+        """Process CSV file for all message types (workers=None uses every CPU core)"""
         print("Enhanced Message Parser v14.1 - Electricity FIXED - Analyzing Messages")
         print("=" * 90)
         print("Loading CSV file...")
         start_time = time.time()
         
         try:
-            df = pd.read_csv(input_file, dtype=str)
+            # Only the message and sender columns are kept; exports often carry many more.
+            # The input may be an uploaded file object, so it is read exactly once.
+            wanted_columns = ('message', 'sender_name')
+            try:
+                # pyarrow parses the CSV with multiple threads when it is installed; it rejects
+                # a callable usecols, so the extra columns are dropped after the read
+                df = pd.read_csv(input_file, dtype=str, engine='pyarrow')
+                df = df[[column for column in df.columns if column in wanted_columns]]
+            except ImportError:
+                df = pd.read_csv(input_file, dtype=str, usecols=lambda column: column in wanted_columns)
         except Exception as e:
             print(f"Error reading CSV: {e}")
             return None
@@ -2079,54 +2248,85 @@ class EnhancedMessageParser:
             df['sender_name'] = ""
         
         print(f"Analyzing {len(df):,} messages for content...")
-        parsed_messages = []
-        rejected_messages = []
+        # Parsed results go straight into their message-type bucket
+        messages_by_type = {t: [] for t in ('otp', 'emi', 'challan', 'transportation', 'epf', 'ecommerce', 'electricity')}
+        parsed_count = 0
+        # Only a small sample of rejections is reported, so the rest are counted and dropped
+        rejected_count = 0
+        sample_rejected_messages = []
         parse_start = time.time()
         batch_size = 1000
         total_messages = len(df)
         
-        for i in range(0, total_messages, batch_size):
-            end_idx = min(i + batch_size, total_messages)
-            for idx in range(i, end_idx):
-                row = df.iloc[idx]
-                message = row['message'] if pd.notna(row['message']) else ""
-                sender = row['sender_name'] if pd.notna(row['sender_name']) else ""
-                
-                parsed_result = self.parse_single_message(message, sender, message_type)
+        # Pull both columns out once instead of building a row Series per message
+        messages = df['message'].fillna("").tolist()
+        senders = df['sender_name'].fillna("").tolist()
+        
+        # SMS exports repeat the same messages heavily, so only distinct (message, sender) rows are parsed
+        rows = list(zip(messages, senders))
+        row_counts = Counter(rows)
+        unique_rows = list(row_counts)
+        
+        # With workers > 1 each process builds its own parser and receives rows in batches;
+        # imap keeps batches in input order
+        if workers is None:
+            workers = os.cpu_count() or 1
+        # A single batch of distinct rows is not worth starting worker processes for
+        use_pool = workers > 1 and len(unique_rows) > batch_size
+        pool = Pool(workers, initializer=_init_worker_parser, initargs=(type(self), message_type)) if use_pool else None
+        try:
+            if pool is not None:
+                batches = (unique_rows[i:i + batch_size] for i in range(0, len(unique_rows), batch_size))
+                unique_results = chain.from_iterable(pool.imap(_parse_worker_batch, batches))
+            else:
+                parse_single_message = self.parse_single_message
+                unique_results = (parse_single_message(message, sender, message_type)
+                                  for message, sender in unique_rows)
+            parsed_results = self._expand_duplicate_results(rows, row_counts, unique_results)
+            
+            for idx, parsed_result in enumerate(parsed_results):
                 parsed_result['original_index'] = idx
                 
                 if parsed_result['status'] == 'parsed':
-                    parsed_messages.append(parsed_result)
+                    parsed_count += 1
+                    bucket = messages_by_type.get(parsed_result.get('message_type'))
+                    if bucket is not None:
+                        bucket.append(parsed_result)
                 else:
-                    rejected_messages.append(parsed_result)
-            
-            progress = (end_idx / total_messages) * 100
-            elapsed = time.time() - parse_start
-            rate = end_idx / elapsed if elapsed > 0 else 0
-            
-            if (end_idx % 10000 == 0) or (end_idx == total_messages):
-                print(f"Progress: {progress:.1f}% ({end_idx:,}/{total_messages:,}) | "
-                      f"Rate: {rate:.0f} msgs/sec | "
-                      f"Parsed: {len(parsed_messages):,} | "
-                      f"Rejected: {len(rejected_messages):,}")
+                    rejected_count += 1
+                    if len(sample_rejected_messages) < 10:
+                        sample_rejected_messages.append(parsed_result)
+                
+                done = idx + 1
+                if (done % 10000 == 0) or (done == total_messages):
+                    progress = (done / total_messages) * 100
+                    elapsed = time.time() - parse_start
+                    rate = done / elapsed if elapsed > 0 else 0
+                    print(f"Progress: {progress:.1f}% ({done:,}/{total_messages:,}) | "
+                          f"Rate: {rate:.0f} msgs/sec | "
+                          f"Parsed: {parsed_count:,} | "
+                          f"Rejected: {rejected_count:,}")
+        finally:
+            if pool is not None:
+                pool.terminate()
         
         parse_time = time.time() - parse_start
         print(f"Analysis completed in {parse_time/60:.1f} minutes")
         
-        # Separate messages by type
-        otp_messages = [msg for msg in parsed_messages if msg.get('message_type') == 'otp']
-        emi_messages = [msg for msg in parsed_messages if msg.get('message_type') == 'emi']
-        challan_messages = [msg for msg in parsed_messages if msg.get('message_type') == 'challan']
-        transportation_messages = [msg for msg in parsed_messages if msg.get('message_type') == 'transportation']
-        epf_messages = [msg for msg in parsed_messages if msg.get('message_type') == 'epf'] 
-        ecommerce_messages = [msg for msg in parsed_messages if msg.get('message_type') == 'ecommerce']
-        electricity_messages = [msg for msg in parsed_messages if msg.get('message_type') == 'electricity'] 
+        otp_messages = messages_by_type['otp']
+        emi_messages = messages_by_type['emi']
+        challan_messages = messages_by_type['challan']
+        transportation_messages = messages_by_type['transportation']
+        epf_messages = messages_by_type['epf']
+        ecommerce_messages = messages_by_type['ecommerce']
+        electricity_messages = messages_by_type['electricity']
         
         results = {
             'metadata': {
                 'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
                 'total_input_messages': int(total_messages),
-                'total_parsed_messages': len(parsed_messages),
+                'total_parsed_messages': parsed_count,
+                'duplicate_messages_reused': int(total_messages) - len(unique_rows),
                 'otp_messages_found': len(otp_messages),
                 'emi_messages_found': len(emi_messages),
                 'challan_messages_found': len(challan_messages),
@@ -2134,8 +2334,8 @@ class EnhancedMessageParser:
                 'epf_messages_found': len(epf_messages),
                 'ecommerce_messages_found': len(ecommerce_messages),
                 'electricity_messages_found': len(electricity_messages), 
-                'rejected_messages': len(rejected_messages),
-                'detection_rate': round((len(parsed_messages) / total_messages) * 100, 2),
+                'rejected_messages': rejected_count,
+                'detection_rate': round((parsed_count / total_messages) * 100, 2),
                 'processing_time_minutes': round(parse_time / 60, 2),
                 'parser_version': '14.1_electricity_fixed'
             },
@@ -2155,7 +2355,7 @@ class EnhancedMessageParser:
             'epf_messages': epf_messages,
             'ecommerce_messages': ecommerce_messages,
             'electricity_messages': electricity_messages, 
-            'sample_rejected_messages': rejected_messages[:10]
+            'sample_rejected_messages': sample_rejected_messages
         }
         
         self.display_parsing_summary(results)
@@ -2166,45 +2366,111 @@ class EnhancedMessageParser:
         
         print(f"Saving results to: {output_file}")
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
+            self._write_results_json(results, output_file)
             print("Results saved successfully!")
         except Exception as e:
             print(f"Error saving results: {e}")
             return None
         
+        # Small indented companion file for reading by hand; the results above are already saved
+        sample_file = f"{os.path.splitext(output_file)[0]}_pretty_sample.json"
+        try:
+            sample = {key: results[key] for key in ('metadata', 'summary_statistics', 'sample_rejected_messages')}
+            with open(sample_file, 'w', encoding='utf-8') as f:
+                json.dump(sample, f, indent=2, ensure_ascii=False)
+            print(f"Readable sample saved to: {sample_file}")
+        except Exception as e:
+            print(f"Warning: could not save readable sample: {e}")
+        
         return results
 
+    def _write_results_json(self, results: Dict, output_file: str):
+        """Write results as compact JSON, serializing messages in chunks instead of the whole document"""
+        # Compact output; indenting roughly doubles size and write time
+        if orjson is not None:
+            # orjson serializes straight to UTF-8 bytes, far faster than json.dumps
+            def dumps(obj):
+                return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            def dumps(obj):
+                return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        
+        chunk_size = 1000
+        with open(output_file, 'wb') as f:
+            f.write(b'{')
+            for key_index, (key, value) in enumerate(results.items()):
+                if key_index:
+                    f.write(b',')
+                f.write(dumps(key) + b':')
+                if isinstance(value, list):
+                    # Serialize messages a chunk at a time: far fewer calls than one per message,
+                    # while the encoded bytes held at once stay bounded by the chunk size
+                    f.write(b'[')
+                    for start in range(0, len(value), chunk_size):
+                        if start:
+                            f.write(b',')
+                        f.write(dumps(value[start:start + chunk_size])[1:-1])
+                    f.write(b']')
+                else:
+                    f.write(dumps(value))
+            f.write(b'}')
+
+    def _quality_metrics(self, messages: List[Dict], presence_fields: Dict[str, str] = None,
+                         confidence_buckets: bool = True) -> Dict:
+        """Confidence average/buckets and per-field completeness counts in a single pass"""
+        presence_fields = presence_fields or {}
+        field_counts = dict.fromkeys(presence_fields, 0)
+        total = high = medium = low = 0
+        for msg in messages:
+            score = msg.get('confidence_score', 0)
+            total += score
+            if score >= 80:
+                high += 1
+            elif score >= 50:
+                medium += 1
+            else:
+                low += 1
+            for metric, field in presence_fields.items():
+                if msg.get(field):
+                    field_counts[metric] += 1
+        
+        metrics = {'average_confidence_score': round(total / len(messages), 2) if messages else 0}
+        if confidence_buckets:
+            metrics['high_confidence_messages'] = high
+            metrics['medium_confidence_messages'] = medium
+            metrics['low_confidence_messages'] = low
+        metrics.update(field_counts)
+        return metrics
+
+    def _count_values(self, messages: List[Dict], field: str) -> Counter:
+        """Frequency of the non-empty values of a field, with one lookup per message"""
+        counts = Counter(msg.get(field) for msg in messages)
+        counts.pop(None, None)
+        counts.pop('', None)
+        return counts
+
+    def _parse_amounts(self, messages: List[Dict], field: str) -> pd.Series:
+        """Numeric values of an amount field, dropping missing and unparseable entries"""
+        amounts = pd.Series([msg.get(field) for msg in messages if msg.get(field)], dtype=object)
+        # Always float: all-integer amounts would otherwise come back as int64/uint64 and wrap when summed
+        return pd.to_numeric(amounts.str.replace(',', '', regex=False), errors='coerce').dropna().astype('float64')
+
     def generate_otp_summary_stats(self, otp_messages: List[Dict]) -> Dict:
         """Generate summary statistics for OTP messages"""
         if not otp_messages:
             return {}
         
-        companies = [msg.get('company_name') for msg in otp_messages if msg.get('company_name')]
-        company_counts = {}
-        for company in companies:
-            company_counts[company] = company_counts.get(company, 0) + 1
+        company_counts = self._count_values(otp_messages, 'company_name')
         
-        purposes = [msg.get('purpose') for msg in otp_messages if msg.get('purpose')]
-        purpose_counts = {}
-        for purpose in purposes:
-            purpose_counts[purpose] = purpose_counts.get(purpose, 0) + 1
-        
-        confidence_scores = [msg.get('confidence_score', 0) for msg in otp_messages]
-        avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
+        purpose_counts = self._count_values(otp_messages, 'purpose')
         
         return {
             'total_count': len(otp_messages),
             'distributions': {
-                'top_companies': dict(sorted(company_counts.items(), key=lambda x: x[1], reverse=True)[:10]),
-                'purposes': dict(sorted(purpose_counts.items(), key=lambda x: x[1], reverse=True)),
+                'top_companies': dict(company_counts.most_common(10)),
+                'purposes': dict(purpose_counts.most_common()),
             },
-            'quality_metrics': {
-                'average_confidence_score': round(avg_confidence, 2),
-                'high_confidence_messages': sum(1 for score in confidence_scores if score >= 80),
-                'medium_confidence_messages': sum(1 for score in confidence_scores if 50 <= score < 80),
-                'low_confidence_messages': sum(1 for score in confidence_scores if score < 50),
-            }
+            'quality_metrics': self._quality_metrics(otp_messages)
         }
 
     def generate_emi_summary_stats(self, emi_messages: List[Dict]) -> Dict:
@@ -2212,50 +2478,33 @@ class EnhancedMessageParser:
         if not emi_messages:
             return {}
         
-        banks = [msg.get('bank_name') for msg in emi_messages if msg.get('bank_name')]
-        bank_counts = {}
-        for bank in banks:
-            bank_counts[bank] = bank_counts.get(bank, 0) + 1
+        bank_counts = self._count_values(emi_messages, 'bank_name')
         
         # Analyze EMI amounts
-        amounts = []
-        for msg in emi_messages:
-            amount_str = msg.get('emi_amount')
-            if amount_str:
-                try:
-                    amount = float(amount_str.replace(',', ''))
-                    amounts.append(amount)
-                except ValueError:
-                    continue
-        
-        confidence_scores = [msg.get('confidence_score', 0) for msg in emi_messages]
-        avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
+        amounts = self._parse_amounts(emi_messages, 'emi_amount')
         
         amount_stats = {}
-        if amounts:
+        if not amounts.empty:
+            stats = amounts.agg(['mean', 'min', 'max', 'sum'])
             amount_stats = {
-                'average_amount': round(sum(amounts) / len(amounts), 2),
-                'min_amount': min(amounts),
-                'max_amount': max(amounts),
-                'total_emi_value': sum(amounts)
+                'average_amount': round(float(stats['mean']), 2),
+                'min_amount': float(stats['min']),
+                'max_amount': float(stats['max']),
+                'total_emi_value': float(stats['sum'])
             }
         
         return {
             'total_count': len(emi_messages),
             'distributions': {
-                'top_banks': dict(sorted(bank_counts.items(), key=lambda x: x[1], reverse=True)[:10]),
+                'top_banks': dict(bank_counts.most_common(10)),
             },
             'amount_statistics': amount_stats,
-            'quality_metrics': {
-                'average_confidence_score': round(avg_confidence, 2),
-                'high_confidence_messages': sum(1 for score in confidence_scores if score >= 80),
-                'medium_confidence_messages': sum(1 for score in confidence_scores if 50 <= score < 80),
-                'low_confidence_messages': sum(1 for score in confidence_scores if score < 50),
-                'messages_with_amount': sum(1 for msg in emi_messages if msg.get('emi_amount')),
-                'messages_with_bank': sum(1 for msg in emi_messages if msg.get('bank_name')),
-                'messages_with_account': sum(1 for msg in emi_messages if msg.get('account_number')),
-                'messages_with_due_date': sum(1 for msg in emi_messages if msg.get('emi_due_date')),
-            }
+            'quality_metrics': self._quality_metrics(emi_messages, {
+                'messages_with_amount': 'emi_amount',
+                'messages_with_bank': 'bank_name',
+                'messages_with_account': 'account_number',
+                'messages_with_due_date': 'emi_due_date',
+            })
         }
 
     def generate_challan_summary_stats(self, challan_messages: List[Dict]) -> Dict:
@@ -2264,57 +2513,37 @@ class EnhancedMessageParser:
             return {}
         
         # Authority distribution
-        authorities = [msg.get('traffic_authority') for msg in challan_messages if msg.get('traffic_authority')]
-        authority_counts = {}
-        for authority in authorities:
-            authority_counts[authority] = authority_counts.get(authority, 0) + 1
+        authority_counts = self._count_values(challan_messages, 'traffic_authority')
         
         # Status distribution - Enhanced with court disposal
-        statuses = [msg.get('challan_status') for msg in challan_messages if msg.get('challan_status')]
-        status_counts = {}
-        for status in statuses:
-            status_counts[status] = status_counts.get(status, 0) + 1
+        status_counts = self._count_values(challan_messages, 'challan_status')
         
         # Analyze fine amounts
-        fine_amounts = []
-        for msg in challan_messages:
-            amount_str = msg.get('fine_amount')
-            if amount_str:
-                try:
-                    amount = float(amount_str.replace(',', ''))
-                    fine_amounts.append(amount)
-                except ValueError:
-                    continue
-        
-        confidence_scores = [msg.get('confidence_score', 0) for msg in challan_messages]
-        avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
+        fine_amounts = self._parse_amounts(challan_messages, 'fine_amount')
         
         fine_stats = {}
-        if fine_amounts:
+        if not fine_amounts.empty:
+            stats = fine_amounts.agg(['mean', 'min', 'max', 'sum'])
             fine_stats = {
-                'average_fine': round(sum(fine_amounts) / len(fine_amounts), 2),
-                'min_fine': min(fine_amounts),
-                'max_fine': max(fine_amounts),
-                'total_fine_value': sum(fine_amounts)
+                'average_fine': round(float(stats['mean']), 2),
+                'min_fine': float(stats['min']),
+                'max_fine': float(stats['max']),
+                'total_fine_value': float(stats['sum'])
             }
         
         return {
             'total_count': len(challan_messages),
             'distributions': {
-                'authorities': dict(sorted(authority_counts.items(), key=lambda x: x[1], reverse=True)),
-                'status_types': dict(sorted(status_counts.items(), key=lambda x: x[1], reverse=True)),
+                'authorities': dict(authority_counts.most_common()),
+                'status_types': dict(status_counts.most_common()),
             },
             'fine_statistics': fine_stats,
-            'quality_metrics': {
-                'average_confidence_score': round(avg_confidence, 2),
-                'high_confidence_messages': sum(1 for score in confidence_scores if score >= 80),
-                'medium_confidence_messages': sum(1 for score in confidence_scores if 50 <= score < 80),
-                'low_confidence_messages': sum(1 for score in confidence_scores if score < 50),
-                'messages_with_challan_number': sum(1 for msg in challan_messages if msg.get('challan_number')),
-                'messages_with_vehicle_number': sum(1 for msg in challan_messages if msg.get('vehicle_number')),
-                'messages_with_fine_amount': sum(1 for msg in challan_messages if msg.get('fine_amount')),
-                'messages_with_payment_link': sum(1 for msg in challan_messages if msg.get('payment_link')),
-            }
+            'quality_metrics': self._quality_metrics(challan_messages, {
+                'messages_with_challan_number': 'challan_number',
+                'messages_with_vehicle_number': 'vehicle_number',
+                'messages_with_fine_amount': 'fine_amount',
+                'messages_with_payment_link': 'payment_link',
+            })
         }
 
     def generate_transportation_summary_stats(self, transportation_messages: List[Dict]) -> Dict:
@@ -2322,18 +2551,11 @@ class EnhancedMessageParser:
         if not transportation_messages:
             return {}
         
-        confidence_scores = [msg.get('confidence_score', 0) for msg in transportation_messages]
-        avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
-        
         return {
             'total_count': len(transportation_messages),
-            'quality_metrics': {
-                'average_confidence_score': round(avg_confidence, 2),
-                'high_confidence_messages': sum(1 for score in confidence_scores if score >= 80),
-                'medium_confidence_messages': sum(1 for score in confidence_scores if 50 <= score < 80),
-                'low_confidence_messages': sum(1 for score in confidence_scores if score < 50),
-                'messages_with_pnr': sum(1 for msg in transportation_messages if msg.get('pnr_number')),
-            }
+            'quality_metrics': self._quality_metrics(transportation_messages, {
+                'messages_with_pnr': 'pnr_number',
+            })
         }
 
     # NEW: EPF summary statistics
@@ -2343,37 +2565,27 @@ class EnhancedMessageParser:
             return {}
         
         # Analyze amounts
-        amounts = []
-        for msg in epf_messages:
-            amount_str = msg.get('amount_credited')
-            if amount_str:
-                try:
-                    amount = float(amount_str.replace(',', ''))
-                    amounts.append(amount)
-                except ValueError:
-                    continue
+        amounts = self._parse_amounts(epf_messages, 'amount_credited')
         
-        confidence_scores = [msg.get('confidence_score', 0) for msg in epf_messages]
-        avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
         
         amount_stats = {}
-        if amounts:
+        if not amounts.empty:
+            stats = amounts.agg(['mean', 'min', 'max', 'sum'])
             amount_stats = {
-                'average_amount': round(sum(amounts) / len(amounts), 2),
-                'min_amount': min(amounts),
-                'max_amount': max(amounts),
-                'total_value': sum(amounts)
+                'average_amount': round(float(stats['mean']), 2),
+                'min_amount': float(stats['min']),
+                'max_amount': float(stats['max']),
+                'total_value': float(stats['sum'])
             }
             
         return {
             'total_count': len(epf_messages),
             'amount_statistics': amount_stats,
-            'quality_metrics': {
-                'average_confidence_score': round(avg_confidence, 2),
-                'messages_with_amount': sum(1 for msg in epf_messages if msg.get('amount_credited')),
-                'messages_with_uan': sum(1 for msg in epf_messages if msg.get('uan_number')),
-                'messages_with_balance': sum(1 for msg in epf_messages if msg.get('available_balance')),
-            }
+            'quality_metrics': self._quality_metrics(epf_messages, {
+                'messages_with_amount': 'amount_credited',
+                'messages_with_uan': 'uan_number',
+                'messages_with_balance': 'available_balance',
+            }, confidence_buckets=False)
         }
 
     # NEW: E-commerce summary statistics
@@ -2382,32 +2594,23 @@ class EnhancedMessageParser:
         if not ecommerce_messages:
             return {}
 
-        platforms = [msg.get('platform') for msg in ecommerce_messages if msg.get('platform')]
-        platform_counts = {}
-        for platform in platforms:
-            platform_counts[platform] = platform_counts.get(platform, 0) + 1
+        platform_counts = self._count_values(ecommerce_messages, 'platform')
 
-        statuses = [msg.get('order_status') for msg in ecommerce_messages if msg.get('order_status')]
-        status_counts = {}
-        for status in statuses:
-            status_counts[status] = status_counts.get(status, 0) + 1
+        status_counts = self._count_values(ecommerce_messages, 'order_status')
 
-        confidence_scores = [msg.get('confidence_score', 0) for msg in ecommerce_messages]
-        avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
 
         return {
             'total_count': len(ecommerce_messages),
             'distributions': {
-                'top_platforms': dict(sorted(platform_counts.items(), key=lambda x: x[1], reverse=True)[:10]),
-                'status_types': dict(sorted(status_counts.items(), key=lambda x: x[1], reverse=True)),
+                'top_platforms': dict(platform_counts.most_common(10)),
+                'status_types': dict(status_counts.most_common()),
             },
-            'quality_metrics': {
-                'average_confidence_score': round(avg_confidence, 2),
-                'messages_with_order_id': sum(1 for msg in ecommerce_messages if msg.get('order_id')),
-                'messages_with_cod_amount': sum(1 for msg in ecommerce_messages if msg.get('amount_to_be_paid')),
-                'messages_with_platform': sum(1 for msg in ecommerce_messages if msg.get('platform')),
-                'messages_with_tracking_link': sum(1 for msg in ecommerce_messages if msg.get('tracking_link')),
-            }
+            'quality_metrics': self._quality_metrics(ecommerce_messages, {
+                'messages_with_order_id': 'order_id',
+                'messages_with_cod_amount': 'amount_to_be_paid',
+                'messages_with_platform': 'platform',
+                'messages_with_tracking_link': 'tracking_link',
+            }, confidence_buckets=False)
         }
 
     # NEW: Electricity summary statistics
@@ -2416,50 +2619,35 @@ class EnhancedMessageParser:
         if not electricity_messages:
             return {}
 
-        providers = [msg.get('service_provider') for msg in electricity_messages if msg.get('service_provider')]
-        provider_counts = {}
-        for provider in providers:
-            provider_counts[provider] = provider_counts.get(provider, 0) + 1
+        provider_counts = self._count_values(electricity_messages, 'service_provider')
 
-        statuses = [msg.get('bill_status') for msg in electricity_messages if msg.get('bill_status')]
-        status_counts = {}
-        for status in statuses:
-            status_counts[status] = status_counts.get(status, 0) + 1
+        status_counts = self._count_values(electricity_messages, 'bill_status')
             
-        amounts = []
-        for msg in electricity_messages:
-            amount_str = msg.get('bill_amount')
-            if amount_str:
-                try:
-                    amounts.append(float(amount_str.replace(',', '')))
-                except ValueError:
-                    continue
+        amounts = self._parse_amounts(electricity_messages, 'bill_amount')
 
-        confidence_scores = [msg.get('confidence_score', 0) for msg in electricity_messages]
-        avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
 
         amount_stats = {}
-        if amounts:
+        if not amounts.empty:
+            stats = amounts.agg(['mean', 'min', 'max', 'sum'])
             amount_stats = {
-                'average_amount': round(sum(amounts) / len(amounts), 2),
-                'min_amount': min(amounts),
-                'max_amount': max(amounts),
-                'total_value': sum(amounts)
+                'average_amount': round(float(stats['mean']), 2),
+                'min_amount': float(stats['min']),
+                'max_amount': float(stats['max']),
+                'total_value': float(stats['sum'])
             }
             
         return {
             'total_count': len(electricity_messages),
             'distributions': {
-                'top_providers': dict(sorted(provider_counts.items(), key=lambda x: x[1], reverse=True)[:10]),
-                'status_types': dict(sorted(status_counts.items(), key=lambda x: x[1], reverse=True)),
+                'top_providers': dict(provider_counts.most_common(10)),
+                'status_types': dict(status_counts.most_common()),
             },
             'amount_statistics': amount_stats,
-            'quality_metrics': {
-                'average_confidence_score': round(avg_confidence, 2),
-                'messages_with_bill_amount': sum(1 for msg in electricity_messages if msg.get('bill_amount')),
-                'messages_with_due_date': sum(1 for msg in electricity_messages if msg.get('due_date')),
-                'messages_with_consumer_number': sum(1 for msg in electricity_messages if msg.get('consumer_number')),
-            }
+            'quality_metrics': self._quality_metrics(electricity_messages, {
+                'messages_with_bill_amount': 'bill_amount',
+                'messages_with_due_date': 'due_date',
+                'messages_with_consumer_number': 'consumer_number',
+            }, confidence_buckets=False)
         }
 
 
@@ -2656,6 +2844,20 @@ class EnhancedMessageParser:
             else:
                 print(f"Rejection Reason: {result.get('reason')}")
 
+# Per-process state for process_csv_file(workers > 1)
+_worker_parser = None
+_worker_message_type = "auto"
+
+def _init_worker_parser(parser_class, message_type: str):
+    """Build one parser per worker process so patterns are compiled once per process"""
+    global _worker_parser, _worker_message_type
+    _worker_parser = parser_class()
+    _worker_message_type = message_type
+
+def _parse_worker_batch(batch: List[Tuple[str, str]]) -> List[Dict]:
+    """Parse one batch of (message, sender_name) pairs in a worker process"""
+    return _worker_parser.parse_many(batch, _worker_message_type)
+
 # Example usage
 if __name__ == "__main__":
     parser = EnhancedMessageParser()
@@ -10,10 +10,26 @@ import json
 import sys
 import os
 import argparse
-from typing import Dict, List, Optional
+import functools
+import gzip
+from typing import Dict, Iterable, List, Optional
+from concurrent.futures import ProcessPoolExecutor
 import time
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# Arrow-backed strings keep a null bitmap instead of one Python object per cell
+CSV_STRING_DTYPE = 'string[pyarrow]' if pyarrow is not None else str
+
 # Import the OTPMessageParser class (assuming it's in the same directory or installed as a module)
 try:
     from parsing import OTPMessageParser
@@ -21,12 +37,151 @@ except ImportError:
     print("Error: Could not import OTPMessageParser. Make sure the parser.py file is in the same directory.")
     sys.exit(1)
 
+# Argument parser built on first use by main() and reused across calls
+_ARG_PARSER = None
+
+# CSV results with more messages than this are not printed to stdout
+STDOUT_MAX_MESSAGES = 1000
+
+
+def open_output(output_file: str, mode: str = 'w'):
+    """Open output_file for writing, gzip-compressing it (level 1, favouring speed) when it ends in .gz"""
+    if output_file.endswith('.gz'):
+        if 'b' in mode:
+            return gzip.open(output_file, mode, compresslevel=1)
+        return gzip.open(output_file, mode + 't', compresslevel=1, encoding='utf-8')
+    if 'b' in mode:
+        return open(output_file, mode)
+    return open(output_file, mode, encoding='utf-8')
+
+
+def write_json_file(data: Dict, output_file: str):
+    """Write data to output_file as indented UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        with open_output(output_file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open_output(output_file) as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def write_json_stream(data: Dict, list_key: str, items: Iterable[Dict], output_file: str):
+    """
+    Write data plus a final list_key array to output_file as indented JSON, one item at a time
+    
+    The output matches write_json_file(data | {list_key: list(items)}) without
+    holding the whole list in memory.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        dumps = lambda obj: orjson.dumps(obj, option=option).decode('utf-8')
+    else:
+        dumps = lambda obj: json.dumps(obj, indent=2, ensure_ascii=False)
+    
+    with open_output(output_file) as f:
+        # Reopen the header object so the array can be appended as its last key
+        header = dumps(data)
+        f.write(header[:-2] + ',\n' if data else '{\n')
+        f.write(f'  {json.dumps(list_key)}: [')
+        
+        separator = '\n    '
+        for item in items:
+            # Encoded strings never contain raw newlines, so re-indenting line breaks nests the item safely
+            f.write(separator + dumps(item).replace('\n', '\n    '))
+            separator = ',\n    '
+        
+        f.write('\n  ]\n}' if separator != '\n    ' else ']\n}')
+
+
+def dumps_json(data: Dict, indent: bool = False) -> str:
+    """Serialize data to a JSON string, using orjson when it is installed"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option).decode('utf-8')
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_parser():
+    """Return the process-wide OTPMessageParser so its patterns are compiled only once"""
+    return OTPMessageParser()
+
+
+def _parse_message_worker(key: tuple) -> Dict:
+    """Parse one (message, sender_name) pair in a worker process using that process's shared parser"""
+    return _get_parser().parse_single_message(*key)
+
+
+def _format_message_record(index: int, result: Dict) -> Dict:
+    """JSON record for one parse_single_message result, shared by the batch and streaming paths"""
+    expiry_info = result['expiry_info']
+    return {
+        'message_index': index,
+        'otp_code': result['otp_code'],
+        'company_service': result['company_name'],
+        'purpose_action': result['purpose'],
+        'validity_duration': f"{expiry_info['duration']} {expiry_info['unit']}" if expiry_info else None,
+        'security_warnings': result['security_warnings'],
+        'reference_id': result['reference_id'],
+        'phone_number': result['phone_number'],
+        'account_info': result['account_info'],
+        'sender_name': result['sender_name'],
+        'full_message': result['raw_message']
+    }
+
+
+def _new_record_stats(total_messages: int = 0) -> Dict:
+    """Zeroed summary counters for _count_record"""
+    return {
+        'total_messages': total_messages,
+        'otp_codes_extracted': 0,
+        'companies_identified': 0,
+        'purposes_identified': 0,
+        'expiry_info_found': 0,
+        'security_warnings_found': 0,
+        'reference_ids_found': 0,
+    }
+
+
+def _count_record(stats: Dict, record: Dict):
+    """Add one record from _format_message_record to the summary counters"""
+    if record['otp_code']:
+        stats['otp_codes_extracted'] += 1
+    if record['company_service']:
+        stats['companies_identified'] += 1
+    if record['purpose_action']:
+        stats['purposes_identified'] += 1
+    if record['validity_duration']:
+        stats['expiry_info_found'] += 1
+    if record['security_warnings']:
+        stats['security_warnings_found'] += 1
+    if record['reference_id']:
+        stats['reference_ids_found'] += 1
+
 
 class OTPParserInterface:
+    # DataFrame column -> JSON record key, in output order
+    RECORD_COLUMN_KEYS = [
+        ('OTP_Code', 'otp_code'),
+        ('Company_Service', 'company_service'),
+        ('Purpose_Action', 'purpose_action'),
+        ('Validity_Duration', 'validity_duration'),
+        ('Security_Warnings', 'security_warnings'),
+        ('Reference_ID', 'reference_id'),
+        ('Phone_Number', 'phone_number'),
+        ('Account_Info', 'account_info'),
+        ('Sender_Name', 'sender_name'),
+        ('Full_Message', 'full_message'),
+    ]
+    RECORD_KEYS = ['original_index'] + [key for _, key in RECORD_COLUMN_KEYS]
+    
     def __init__(self):
-        self.parser = OTPMessageParser()
+        self.parser = _get_parser()
         
-    def parse_single_message(self, message: str, sender_name: str = "", output_file: str = None) -> Dict:
+    def parse_single_message(self, message: str, sender_name: str = "", output_file: str = None,
+                             generated_at: str = None) -> Dict:
         """
         Parse a single OTP message and return results in JSON format
         
@@ -34,6 +189,8 @@ class OTPParserInterface:
             message (str): The OTP message text
             sender_name (str): Optional sender name
             output_file (str): Optional output file path for JSON
+            generated_at (str): Optional pre-formatted timestamp, so callers parsing
+                many messages can format it once instead of per message
             
         Returns:
             Dict: Parsed results in JSON format
@@ -43,10 +200,23 @@ class OTPParserInterface:
         # Parse the message
         result = self.parser.parse_single_message(message, sender_name)
         
+        # Read each field once; several are used for both the data and the success flags
+        otp_code = result['otp_code']
+        company_name = result['company_name']
+        purpose = result['purpose']
+        security_warnings = result['security_warnings']
+        reference_id = result['reference_id']
+        expiry_info = result['expiry_info']
+        if expiry_info:
+            validity_duration = f"{expiry_info['duration']} {expiry_info['unit']}"
+            expiry_full_text = expiry_info['full_text']
+        else:
+            validity_duration = expiry_full_text = None
+        
         # Format result for JSON output
         json_result = {
             'metadata': {
-                'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'generated_at': generated_at or time.strftime('%Y-%m-%d %H:%M:%S'),
                 'parsing_type': 'single_message',
                 'parser_version': '1.0'
             },
@@ -55,54 +225,60 @@ class OTPParserInterface:
                 'sender_name': sender_name
             },
             'parsed_data': {
-                'otp_code': result['otp_code'],
-                'company_service': result['company_name'],
-                'purpose_action': result['purpose'],
-                'validity_duration': f"{result['expiry_info']['duration']} {result['expiry_info']['unit']}" if result['expiry_info'] else None,
-                'expiry_full_text': result['expiry_info']['full_text'] if result['expiry_info'] else None,
-                'security_warnings': result['security_warnings'],
-                'reference_id': result['reference_id'],
+                'otp_code': otp_code,
+                'company_service': company_name,
+                'purpose_action': purpose,
+                'validity_duration': validity_duration,
+                'expiry_full_text': expiry_full_text,
+                'security_warnings': security_warnings,
+                'reference_id': reference_id,
                 'phone_number': result['phone_number'],
                 'account_info': result['account_info'],
                 'sender_name': result['sender_name']
             },
             'extraction_success': {
-                'otp_extracted': result['otp_code'] is not None,
-                'company_identified': result['company_name'] is not None,
-                'purpose_identified': result['purpose'] is not None,
-                'expiry_found': result['expiry_info'] is not None,
-                'security_warnings_found': len(result['security_warnings']) > 0,
-                'reference_id_found': result['reference_id'] is not None
+                'otp_extracted': otp_code is not None,
+                'company_identified': company_name is not None,
+                'purpose_identified': purpose is not None,
+                'expiry_found': expiry_info is not None,
+                'security_warnings_found': len(security_warnings) > 0,
+                'reference_id_found': reference_id is not None
             }
         }
         
         # Save to file if specified
         if output_file:
             try:
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(json_result, f, indent=2, ensure_ascii=False)
+                write_json_file(json_result, output_file)
                 print(f"Results saved to: {output_file}")
             except Exception as e:
                 print(f"Error saving JSON file: {e}")
         
         return json_result
     
-    def parse_csv_file(self, input_file: str, output_file: str = None) -> Dict:
+    def parse_csv_file(self, input_file: str, output_file: str = None, keep_records: bool = True,
+                       max_kept_records: Optional[int] = None, output_format: str = 'records') -> Dict:
         """
         Parse CSV file containing OTP messages and return results in JSON format
         
         Args:
             input_file (str): Path to the CSV file
             output_file (str): Optional output file path for JSON
+            keep_records (bool): Include parsed_messages in the returned dict; when False
+                                 records are streamed straight to the output file
+            max_kept_records (int): Optional limit; files with more messages are handled
+                                    as if keep_records were False
+            output_format (str): 'records' for a list of per-message objects, or 'columnar'
+                                 for {"columns": [...], "data": {column: [values]}}
             
         Returns:
             Dict: Parsed results in JSON format
         """
         print(f"Parsing CSV file: {input_file}")
         
-        # Validate input file
-        if not os.path.exists(input_file):
-            raise FileNotFoundError(f"Input file not found: {input_file}")
+        if output_format not in ('records', 'columnar'):
+            raise ValueError(f"Unknown output format: {output_format}")
+        columnar = output_format == 'columnar'
         
         # Use the original parser's CSV processing method
         try:
@@ -112,8 +288,16 @@ class OTPParserInterface:
             if df is None:
                 raise ValueError("Failed to parse CSV file")
             
+            if max_kept_records is not None and len(df) > max_kept_records:
+                keep_records = False
+            
             # Convert DataFrame to JSON format
-            json_result = self._dataframe_to_json(df, input_file)
+            present = self._presence_masks(df)
+            json_result = self._dataframe_to_json(df, input_file, include_records=keep_records and not columnar,
+                                                  present=present)
+            if columnar:
+                # Column lists hold no per-row dicts, so they are cheap enough to build in full
+                json_result['parsed_messages'] = self._columnar_records(df, present=present)
             
             # Determine output file if not specified
             if output_file is None:
@@ -122,60 +306,166 @@ class OTPParserInterface:
             
             # Save JSON output
             try:
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(json_result, f, indent=2, ensure_ascii=False)
+                if keep_records or columnar:
+                    write_json_file(json_result, output_file)
+                else:
+                    write_json_stream(json_result, 'parsed_messages', self._iter_records(df, present=present),
+                                      output_file)
                 print(f"\n✅ JSON results saved to: {output_file}")
             except Exception as e:
                 print(f"Error saving JSON file: {e}")
             
+            if columnar and not keep_records:
+                del json_result['parsed_messages']
+            
             return json_result
             
+        except FileNotFoundError:
+            # Opening the file is the existence check; no separate stat beforehand
+            raise FileNotFoundError(f"Input file not found: {input_file}") from None
         except Exception as e:
             print(f"Error processing CSV file: {e}")
             raise
     
-    def _dataframe_to_json(self, df: pd.DataFrame, input_file: str) -> Dict:
-        """Convert DataFrame results to structured JSON format"""
+    def parse_csv_file_streaming(self, input_file: str, output_file: str = None, chunksize: int = 10000,
+                                 quiet: bool = False) -> Dict:
+        """
+        Parse a large CSV file chunk by chunk, writing one JSON record per line (NDJSON)
+        
+        Only the summary counters are kept in memory; they are returned and also
+        saved next to the output file as <name>.meta.json.
+        
+        Args:
+            input_file (str): Path to the CSV file
+            output_file (str): Optional output NDJSON file path
+            chunksize (int): Number of CSV rows read at a time
+            quiet (bool): Skip the per-chunk progress lines
+            
+        Returns:
+            Dict: Metadata and summary statistics
+        """
+        print(f"Streaming CSV file: {input_file}")
+        
+        # Open the input before creating the output, so a missing file leaves nothing behind
+        try:
+            reader = pd.read_csv(input_file, dtype=CSV_STRING_DTYPE, chunksize=chunksize)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Input file not found: {input_file}") from None
+        
+        if output_file is None:
+            base_name = Path(input_file).stem
+            output_file = f"{base_name}_parsed_otp_results.ndjson"
+        
+        stats = _new_record_stats()
+        
+        with reader, open_output(output_file) as f:
+            for chunk in reader:
+                messages = chunk['message'].fillna("").tolist()
+                if 'sender_name' in chunk.columns:
+                    senders = chunk['sender_name'].fillna("").tolist()
+                else:
+                    senders = [""] * len(messages)
+                
+                for message, sender in zip(messages, senders):
+                    result = self.parser.parse_single_message(message, sender)
+                    record = _format_message_record(stats['total_messages'], result)
+                    f.write(dumps_json(record))
+                    f.write("\n")
+                    
+                    stats['total_messages'] += 1
+                    _count_record(stats, record)
+                
+                if not quiet:
+                    print(f"Processed {stats['total_messages']:,} messages...")
+        
+        meta = {
+            'metadata': {
+                'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'input_file': input_file,
+                'output_file': output_file,
+                'parsing_type': 'csv_stream',
+                'parser_version': '1.0',
+                'description': 'Parsed OTP SMS messages, one JSON record per line in output_file'
+            },
+            'summary_statistics': stats
+        }
+        
+        ndjson_file = output_file[:-3] if output_file.endswith('.gz') else output_file
+        meta_file = f"{os.path.splitext(ndjson_file)[0]}.meta.json"
+        write_json_file(meta, meta_file)
+        print(f"\n✅ NDJSON results saved to: {output_file}")
+        print(f"Summary saved to: {meta_file}")
+        
+        return meta
+    
+    def _presence_masks(self, df: pd.DataFrame) -> Dict:
+        """Return a boolean not-null array per output column, so stats and records share one scan"""
+        return {column: df[column].notna().to_numpy()
+                for column in ['Original_Row_Index'] + [column for column, _ in self.RECORD_COLUMN_KEYS]}
+    
+    def _record_columns(self, df: pd.DataFrame, present: Dict, start: int = 0, stop: Optional[int] = None) -> List[List]:
+        """Return the output values for rows start:stop as one list per RECORD_KEYS entry"""
+        chunk = df.iloc[start:stop]
+        
+        # Coerce each column once instead of every cell separately
+        original_indexes = [int(value) if is_present else None
+                            for value, is_present in zip(chunk['Original_Row_Index'].tolist(),
+                                                         present['Original_Row_Index'][start:stop].tolist())]
+        # str() for present cells, None for missing ones
+        string_columns = [chunk[column].astype(str).astype(object).where(present[column][start:stop], None).tolist()
+                          for column, _ in self.RECORD_COLUMN_KEYS]
+        
+        return [original_indexes] + string_columns
+    
+    def _iter_records(self, df: pd.DataFrame, chunksize: int = 10000, present: Dict = None):
+        """Yield one JSON record dict per DataFrame row, converting chunksize rows at a time"""
+        keys = self.RECORD_KEYS
+        if present is None:
+            present = self._presence_masks(df)
+        
+        for start in range(0, len(df), chunksize):
+            for values in zip(*self._record_columns(df, present, start, start + chunksize)):
+                yield dict(zip(keys, values))
+    
+    def _columnar_records(self, df: pd.DataFrame, present: Dict = None) -> Dict:
+        """Return all records in columnar form, naming each key once instead of once per row"""
+        if present is None:
+            present = self._presence_masks(df)
+        
+        return {
+            'columns': list(self.RECORD_KEYS),
+            'data': dict(zip(self.RECORD_KEYS, self._record_columns(df, present))),
+        }
+    
+    def _dataframe_to_json(self, df: pd.DataFrame, input_file: str, include_records: bool = True,
+                           present: Dict = None) -> Dict:
+        """Convert DataFrame results to structured JSON format (parsed_messages only if include_records)"""
         
         total_messages = len(df)
+        if present is None:
+            present = self._presence_masks(df)
         
-        # Calculate statistics
+        # Calculate statistics from the shared not-null masks
         stats = {
             'total_messages': int(total_messages),
-            'otp_codes_extracted': int(df['OTP_Code'].notna().sum()),
-            'companies_identified': int(df['Company_Service'].notna().sum()),
-            'purposes_identified': int(df['Purpose_Action'].notna().sum()),
-            'expiry_info_found': int(df['Validity_Duration'].notna().sum()),
-            'security_warnings_found': int(df['Security_Warnings'].notna().sum()),
-            'reference_ids_found': int(df['Reference_ID'].notna().sum()),
+            'otp_codes_extracted': int(present['OTP_Code'].sum()),
+            'companies_identified': int(present['Company_Service'].sum()),
+            'purposes_identified': int(present['Purpose_Action'].sum()),
+            'expiry_info_found': int(present['Validity_Duration'].sum()),
+            'security_warnings_found': int(present['Security_Warnings'].sum()),
+            'reference_ids_found': int(present['Reference_ID'].sum()),
         }
         
         # Calculate accuracy metrics
         accuracy_metrics = self.parser.calculate_accuracy_metrics(df)
         
-        # Convert DataFrame to records
-        records = []
-        for _, row in df.iterrows():
-            record = {
-                'original_index': int(row['Original_Row_Index']) if pd.notna(row['Original_Row_Index']) else None,
-                'otp_code': str(row['OTP_Code']) if pd.notna(row['OTP_Code']) else None,
-                'company_service': str(row['Company_Service']) if pd.notna(row['Company_Service']) else None,
-                'purpose_action': str(row['Purpose_Action']) if pd.notna(row['Purpose_Action']) else None,
-                'validity_duration': str(row['Validity_Duration']) if pd.notna(row['Validity_Duration']) else None,
-                'security_warnings': str(row['Security_Warnings']) if pd.notna(row['Security_Warnings']) else None,
-                'reference_id': str(row['Reference_ID']) if pd.notna(row['Reference_ID']) else None,
-                'phone_number': str(row['Phone_Number']) if pd.notna(row['Phone_Number']) else None,
-                'account_info': str(row['Account_Info']) if pd.notna(row['Account_Info']) else None,
-                'sender_name': str(row['Sender_Name']) if pd.notna(row['Sender_Name']) else None,
-                'full_message': str(row['Full_Message']) if pd.notna(row['Full_Message']) else None,
-            }
-            records.append(record)
-        
-        # Create distribution analysis
+        # Create distribution analysis (value_counts already drops missing values);
+        # only the top 20 companies are kept, so select them with nlargest instead of sorting every company
+        top_companies = df['Company_Service'].value_counts(sort=False).nlargest(20)
         distribution_analysis = {
-            'company_distribution': {str(k): int(v) for k, v in df['Company_Service'].value_counts().head(20).items() if pd.notna(k)},
-            'purpose_distribution': {str(k): int(v) for k, v in df['Purpose_Action'].value_counts().items() if pd.notna(k)},
-            'expiry_distribution': {str(k): int(v) for k, v in df['Validity_Duration'].value_counts().items() if pd.notna(k)},
+            'company_distribution': {str(k): int(v) for k, v in top_companies.items()},
+            'purpose_distribution': {str(k): int(v) for k, v in df['Purpose_Action'].value_counts().items()},
+            'expiry_distribution': {str(k): int(v) for k, v in df['Validity_Duration'].value_counts().items()},
         }
         
         # Create final JSON structure
@@ -190,8 +480,9 @@ class OTPParserInterface:
             'summary_statistics': stats,
             'accuracy_metrics': accuracy_metrics,
             'distribution_analysis': distribution_analysis,
-            'parsed_messages': records
         }
+        if include_records:
+            json_result['parsed_messages'] = list(self._iter_records(df, present=present))
         
         return json_result
     
@@ -247,18 +538,21 @@ class OTPParserInterface:
             print("PARSING RESULTS")
             print("="*50)
             
+            # Build the summary once and write it with a single print call
             parsed_data = result['parsed_data']
-            print(f"OTP Code: {parsed_data['otp_code']}")
-            print(f"Company/Service: {parsed_data['company_service']}")
-            print(f"Purpose: {parsed_data['purpose_action']}")
-            print(f"Validity: {parsed_data['validity_duration']}")
-            print(f"Security Warnings: {len(parsed_data['security_warnings'])} found")
-            print(f"Reference ID: {parsed_data['reference_id']}")
-            print(f"Phone Number: {parsed_data['phone_number']}")
+            print(
+                f"OTP Code: {parsed_data['otp_code']}\n"
+                f"Company/Service: {parsed_data['company_service']}\n"
+                f"Purpose: {parsed_data['purpose_action']}\n"
+                f"Validity: {parsed_data['validity_duration']}\n"
+                f"Security Warnings: {len(parsed_data['security_warnings'])} found\n"
+                f"Reference ID: {parsed_data['reference_id']}\n"
+                f"Phone Number: {parsed_data['phone_number']}"
+            )
             
             if not output_file:
                 print("\nFull JSON Output:")
-                print(json.dumps(result, indent=2, ensure_ascii=False))
+                print(dumps_json(result, indent=True))
                 
         except Exception as e:
             print(f"Error parsing message: {e}")
@@ -318,6 +612,12 @@ Examples:
   # Parse a CSV file
   python otp_parser_interface.py -f messages.csv -o parsed_results.json
   
+  # Stream a large CSV file to NDJSON (one record per line)
+  python otp_parser_interface.py -f messages.csv -o parsed_results.ndjson --stream
+  
+  # Save CSV results in columnar form (one list per field)
+  python otp_parser_interface.py -f messages.csv -o parsed_results.json --columnar
+  
   # Run in interactive mode
   python otp_parser_interface.py
         """
@@ -330,9 +630,11 @@ Examples:
     
     # Optional arguments
     parser.add_argument('-s', '--sender', type=str, default="", help='Sender name (for single message mode)')
-    parser.add_argument('-o', '--output', type=str, help='Output JSON file path')
+    parser.add_argument('-o', '--output', type=str, help='Output JSON file path (gzip-compressed if it ends in .gz)')
     parser.add_argument('-q', '--quiet', action='store_true', help='Suppress progress output')
     parser.add_argument('--pretty', action='store_true', help='Pretty print JSON output to console')
+    parser.add_argument('--stream', action='store_true', help='Stream CSV results to NDJSON in chunks (for large files)')
+    parser.add_argument('--columnar', action='store_true', help='Store CSV results as one list per field instead of one object per message')
     
     return parser
 
@@ -340,9 +642,11 @@ Examples:
 def main():
     """Main function to handle different execution modes"""
     
-    # Create argument parser
-    arg_parser = create_command_line_interface()
-    args = arg_parser.parse_args()
+    # Create argument parser (once per process)
+    global _ARG_PARSER
+    if _ARG_PARSER is None:
+        _ARG_PARSER = create_command_line_interface()
+    args = _ARG_PARSER.parse_args()
     
     # Initialize the OTP parser interface
     otp_interface = OTPParserInterface()
@@ -362,11 +666,23 @@ def main():
             
             if args.pretty:
                 print("\nParsed Results:")
-                print(json.dumps(result, indent=2, ensure_ascii=False))
+                print(dumps_json(result, indent=True))
             
             if not args.output and not args.pretty:
                 # Output JSON to stdout for piping
-                print(json.dumps(result, ensure_ascii=False))
+                print(dumps_json(result))
+        
+        # Command line mode with CSV file, streamed to NDJSON
+        elif args.file and args.stream:
+            if not args.quiet:
+                print("Command Line Mode - CSV File (streaming)")
+                print("="*50)
+            
+            result = otp_interface.parse_csv_file_streaming(args.file, args.output, quiet=args.quiet)
+            
+            stats = result['summary_statistics']
+            print(f"\nMessages processed: {stats['total_messages']:,}")
+            print(f"OTP codes extracted: {stats['otp_codes_extracted']:,}")
         
         # Command line mode with CSV file
         elif args.file:
@@ -374,7 +690,12 @@ def main():
                 print("Command Line Mode - CSV File")
                 print("="*50)
             
-            result = otp_interface.parse_csv_file(args.file, args.output)
+            # Records only need to stay in memory when they are printed to stdout,
+            # which is skipped for files over STDOUT_MAX_MESSAGES
+            print_records = not args.output and not args.pretty
+            result = otp_interface.parse_csv_file(args.file, args.output, keep_records=print_records,
+                                                  max_kept_records=STDOUT_MAX_MESSAGES,
+                                                  output_format='columnar' if args.columnar else 'records')
             
             if args.pretty:
                 # Show summary for large files
@@ -386,12 +707,12 @@ def main():
                 print(f"OTP extraction accuracy: {accuracy['otp_extraction_accuracy']}%")
                 print(f"Overall completeness: {accuracy['overall_completeness_score']}%")
             
-            if not args.output and not args.pretty:
+            if print_records:
                 # Output JSON to stdout (be careful with large files)
-                if result['summary_statistics']['total_messages'] > 1000:
+                if result['summary_statistics']['total_messages'] > STDOUT_MAX_MESSAGES:
                     print("Large file detected. Use --output flag to save to file instead of printing to console.")
                 else:
-                    print(json.dumps(result, ensure_ascii=False))
+                    print(dumps_json(result))
         
         # Interactive mode
         else:
@@ -408,16 +729,20 @@ def main():
 class OTPBatchProcessor:
     """Additional utility class for batch processing multiple messages"""
     
+    # Below this many messages the process pool startup costs more than it saves
+    PARALLEL_MIN_MESSAGES = 1000
+    
     def __init__(self):
-        self.parser = OTPMessageParser()
+        self.parser = _get_parser()
     
-    def parse_message_list(self, messages: List[Dict], output_file: str = None) -> Dict:
+    def parse_message_list(self, messages: List[Dict], output_file: str = None, workers: Optional[int] = None) -> Dict:
         """
         Parse a list of message dictionaries
         
         Args:
             messages (List[Dict]): List of messages with 'message' and optional 'sender_name' keys
             output_file (str): Optional output file path
+            workers (int): Worker processes to use (defaults to os.cpu_count(); 1 parses serially)
             
         Returns:
             Dict: Parsed results in JSON format
@@ -426,40 +751,27 @@ class OTPBatchProcessor:
         print(f"Processing {len(messages)} messages...")
         
         parsed_results = []
+        stats = _new_record_stats(len(messages))
+        if workers is None:
+            workers = os.cpu_count() or 1
+        
+        # Duplicate messages are common in SMS exports, so parse each distinct
+        # (message, sender) pair once and look the result up for every row
+        keys = [(msg_data.get('message', ''), msg_data.get('sender_name', '')) for msg_data in messages]
+        unique_keys = list(dict.fromkeys(keys))
+        
+        if workers > 1 and len(unique_keys) >= self.PARALLEL_MIN_MESSAGES:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = dict(zip(unique_keys, executor.map(_parse_message_worker, unique_keys, chunksize=256)))
+        else:
+            parse_single_message = self.parser.parse_single_message
+            parsed = {key: parse_single_message(*key) for key in unique_keys}
         
-        for i, msg_data in enumerate(messages):
-            message = msg_data.get('message', '')
-            sender = msg_data.get('sender_name', '')
-            
-            result = self.parser.parse_single_message(message, sender)
-            
-            # Format for JSON
-            formatted_result = {
-                'message_index': i,
-                'otp_code': result['otp_code'],
-                'company_service': result['company_name'],
-                'purpose_action': result['purpose'],
-                'validity_duration': f"{result['expiry_info']['duration']} {result['expiry_info']['unit']}" if result['expiry_info'] else None,
-                'security_warnings': result['security_warnings'],
-                'reference_id': result['reference_id'],
-                'phone_number': result['phone_number'],
-                'account_info': result['account_info'],
-                'sender_name': result['sender_name'],
-                'full_message': result['raw_message']
-            }
-            
+        for i, key in enumerate(keys):
+            # Format for JSON and update summary statistics in the same pass
+            formatted_result = _format_message_record(i, parsed[key])
             parsed_results.append(formatted_result)
-        
-        # Calculate summary statistics
-        total_count = len(parsed_results)
-        stats = {
-            'total_messages': total_count,
-            'otp_codes_extracted': sum(1 for r in parsed_results if r['otp_code']),
-            'companies_identified': sum(1 for r in parsed_results if r['company_service']),
-            'purposes_identified': sum(1 for r in parsed_results if r['purpose_action']),
-            'expiry_info_found': sum(1 for r in parsed_results if r['validity_duration']),
-            'security_warnings_found': sum(1 for r in parsed_results if r['security_warnings']),
-        }
+            _count_record(stats, formatted_result)
         
         # Create final JSON structure
         json_result = {
@@ -475,8 +787,7 @@ class OTPBatchProcessor:
         # Save to file if specified
         if output_file:
             try:
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(json_result, f, indent=2, ensure_ascii=False)
+                write_json_file(json_result, output_file)
                 print(f"Batch results saved to: {output_file}")
             except Exception as e:
                 print(f"Error saving JSON file: {e}")
@@ -495,7 +806,7 @@ def example_single_message():
     result = parser_interface.parse_single_message(sample_message, sample_sender)
     
     print("Example Single Message Parsing:")
-    print(json.dumps(result, indent=2, ensure_ascii=False))
+    print(dumps_json(result, indent=True))
 
 
 def example_batch_processing():
@@ -520,7 +831,7 @@ def example_batch_processing():
     result = batch_processor.parse_message_list(sample_messages)
     
     print("Example Batch Processing:")
-    print(json.dumps(result['summary_statistics'], indent=2, ensure_ascii=False))
+    print(dumps_json(result['summary_statistics'], indent=True))
 
 
 if __name__ == "__main__":
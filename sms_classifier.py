@@ -148,35 +148,99 @@ class SMSClassifier:
             r'\buidai\.gov\.in\b',
         ]
         
+        # Phrase lists for the substring checks in the context helpers
+        # Strong promotional indicators that should exclude even if OTP-like
+        self.strong_promotional_phrases = [
+            'data quota used', 'webinar:', 'tap to reset', 'registration is initiated',
+            'exploring the field', 'exam dates, registration, eligibility'
+        ]
+        
+        # Strong OTP-specific phrases
+        self.strong_otp_phrases = [
+            'is your otp', 'is the otp', 'otp is', 'one time password is',
+            'your otp for', 'otp for your', 'to proceed on', 'otp to login',
+            'otp to register', 'use one time password', 'your one time password'
+        ]
+        
+        # Security context phrases specific to OTP
+        self.security_phrases = [
+            'do not share', 'never call', 'never message', 'will never call',
+            'never calls you', 'keep your account safe', 'for security reasons',
+            'gives them full access'
+        ]
+        
+        # Platforms whose OTPs count with account/login context
+        self.otp_platforms = ['dream11', 'zupee', 'paytm', 'meesho', 'phonepe', 'ajio', 'jio']
+        self.platform_account_words = ['account', 'login', 'register', 'proceed']
+        
         # Compile patterns for better performance
+        self.compiled_whitespace = re.compile(r'\s+')
         self.compiled_banking_exclusions = [re.compile(pattern, re.IGNORECASE) for pattern in self.banking_exclusion_patterns]
         self.compiled_promotional_exclusions = [re.compile(pattern, re.IGNORECASE) for pattern in self.promotional_exclusion_patterns]
         self.compiled_true_otp_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.true_otp_patterns]
         self.compiled_gov_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.government_patterns]
+        # classify_message only asks whether any pattern of a group matches, which one alternation answers in a single search
+        self.banking_exclusion_regex = re.compile('|'.join(f'(?:{p})' for p in self.banking_exclusion_patterns), re.IGNORECASE)
+        self.promotional_exclusion_regex = re.compile('|'.join(f'(?:{p})' for p in self.promotional_exclusion_patterns), re.IGNORECASE)
+        self.true_otp_regex = re.compile('|'.join(f'(?:{p})' for p in self.true_otp_patterns), re.IGNORECASE)
+        self.gov_regex = re.compile('|'.join(f'(?:{p})' for p in self.government_patterns), re.IGNORECASE)
+        # 4-8 digit numbers in OTP context; both need a run of four digits
+        self.compiled_digit_run = re.compile(r'\d{4}')
+        self.compiled_otp_number_patterns = [
+            re.compile(r'\b\d{4,8}\b.*\b(?:otp|one\s*time\s*password)\b', re.IGNORECASE),
+            re.compile(r'\b(?:otp|one\s*time\s*password)\b.*\b\d{4,8}\b', re.IGNORECASE),
+        ]
+        self.compiled_otp_extraction_patterns = [
+            re.compile(r'\b(\d{4,8})\s*is\s*(?:your|the)\s*(?:otp|one\s*time\s*password)\b', re.IGNORECASE),
+            re.compile(r'\byour\s*(?:otp|one\s*time\s*password)\s*(?:is|:)\s*(\d{4,8})\b', re.IGNORECASE),
+            re.compile(r'\b(?:otp|one\s*time\s*password)\s*(?:is|:)\s*(\d{4,8})\b', re.IGNORECASE),
+        ]
+        # The context helpers below match these against already lowercased text
+        self.compiled_banking_context_patterns = [
+            re.compile(r'\b(?:credited|debited)\s*by\s*rs\.?\s*[\d,]+'),  # Transaction amounts
+            re.compile(r'\b(?:total|clr|available)\s*bal(?:ance)?\s*:\s*rs\.?\s*[\d,]+'),  # Balance statements
+            re.compile(r'\ba/c\s*\w+.*(?:credited|debited)'),  # Account transactions
+        ]
+        self.compiled_promotional_context_patterns = [
+            re.compile(r'\b\d+%\s*(?:daily\s*)?data\s*quota\s*used\b'),
+            re.compile(r'\bwebinar\s*:.*(?:exploring|all\s*about)'),
+            re.compile(r'\btap\s*to\s*reset\s*your\s*\w+\s*password\b'),
+        ]
+        self.compiled_registration_initiated = re.compile(r'\bregistration\s*is\s*initiated\s*for\b')
+        self.compiled_validity_patterns = [
+            re.compile(r'\bvalid\s*for\s*\d+\s*(?:minutes?|mins?)\b'),
+            re.compile(r'\bexpires?\s*in\s*\d+\s*(?:minutes?|mins?)\b'),
+            re.compile(r'\bis\s*valid\s*for\s*\d+\s*(?:minutes?|mins?)\b'),
+        ]
 
     def clean_text(self, text: str) -> str:
         """Clean and normalize text for better matching"""
-        if pd.isna(text):
-            return ""
+        # process_csv fills missing cells with "" up front, so pd.isna and str() are only needed for other input
+        if type(text) is not str:
+            if pd.isna(text):
+                return ""
+            text = str(text)
         
         # Convert to string and preserve important punctuation
-        text = str(text).strip()
+        text = text.strip()
         
         # Remove extra whitespaces but preserve structure
-        text = re.sub(r'\s+', ' ', text)
+        text = self.compiled_whitespace.sub(' ', text)
         
         return text
 
-    def has_actual_otp_number(self, text: str) -> bool:
+    def has_actual_otp_number(self, text: str, text_lower: str = None) -> bool:
         """Check if text contains an actual OTP number (4-8 digits)"""
-        # Look for 4-8 digit numbers in OTP context
-        otp_number_patterns = [
-            r'\b\d{4,8}\b.*\b(?:otp|one\s*time\s*password)\b',
-            r'\b(?:otp|one\s*time\s*password)\b.*\b\d{4,8}\b',
-        ]
+        # Both patterns need 'otp' or 'one time password', so most messages are rejected without a regex
+        if text_lower is None:
+            text_lower = text.lower()
+        if 'otp' not in text_lower and 'one' not in text_lower:
+            return False
+        if not self.compiled_digit_run.search(text):
+            return False
         
-        for pattern in otp_number_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
+        for pattern in self.compiled_otp_number_patterns:
+            if pattern.search(text):
                 return True
         
         return False
@@ -190,40 +254,22 @@ class SMSClassifier:
                 return match.group(1)
         
         # Alternative extraction for OTP numbers
-        otp_extraction_patterns = [
-            r'\b(\d{4,8})\s*is\s*(?:your|the)\s*(?:otp|one\s*time\s*password)\b',
-            r'\byour\s*(?:otp|one\s*time\s*password)\s*(?:is|:)\s*(\d{4,8})\b',
-            r'\b(?:otp|one\s*time\s*password)\s*(?:is|:)\s*(\d{4,8})\b',
-        ]
-        
-        for pattern in otp_extraction_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in self.compiled_otp_extraction_patterns:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         
         return None
 
-    def is_strong_banking_context(self, text: str) -> bool:
+    def is_strong_banking_context(self, text: str, text_lower: str = None) -> bool:
         """Check for strong banking context that should override OTP classification"""
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
         
-        # Very specific banking transaction patterns
-        strong_banking_indicators = [
-            'credited by rs', 'debited by rs', 'total bal:', 'clr bal:', 
-            'available bal:', 'account balance:', 'a/c'
-        ]
-        
-        # Check for transaction amounts
-        if re.search(r'\b(?:credited|debited)\s*by\s*rs\.?\s*[\d,]+', text_lower):
-            return True
-        
-        # Check for balance statements
-        if re.search(r'\b(?:total|clr|available)\s*bal(?:ance)?\s*:\s*rs\.?\s*[\d,]+', text_lower):
-            return True
-        
-        # Check for account transaction patterns
-        if re.search(r'\ba/c\s*\w+.*(?:credited|debited)', text_lower):
-            return True
+        # Check for transaction amounts, balance statements and account transaction patterns
+        for pattern in self.compiled_banking_context_patterns:
+            if pattern.search(text_lower):
+                return True
         
         # Bank specific warnings (but not generic OTP warnings)
         if 'emi postponement' in text_lower and 'never share otp' in text_lower:
@@ -234,113 +280,85 @@ class SMSClassifier:
         
         return False
 
-    def is_promotional_message(self, text: str) -> bool:
+    def is_promotional_message(self, text: str, text_lower: str = None) -> bool:
         """Check if message is promotional/notification rather than OTP"""
-        text_lower = text.lower()
-        
-        # Strong promotional indicators that should exclude even if OTP-like
-        strong_promotional = [
-            'data quota used', 'webinar:', 'tap to reset', 'registration is initiated',
-            'exploring the field', 'exam dates, registration, eligibility'
-        ]
+        if text_lower is None:
+            text_lower = text.lower()
         
-        for indicator in strong_promotional:
+        for indicator in self.strong_promotional_phrases:
             if indicator in text_lower:
                 return True
         
         # Check for specific promotional patterns
-        if re.search(r'\b\d+%\s*(?:daily\s*)?data\s*quota\s*used\b', text_lower):
-            return True
-        
-        if re.search(r'\bwebinar\s*:.*(?:exploring|all\s*about)', text_lower):
-            return True
-        
-        if re.search(r'\btap\s*to\s*reset\s*your\s*\w+\s*password\b', text_lower):
-            return True
+        for pattern in self.compiled_promotional_context_patterns:
+            if pattern.search(text_lower):
+                return True
         
         # Registration without OTP number context
-        if re.search(r'\bregistration\s*is\s*initiated\s*for\b', text_lower) and not self.has_actual_otp_number(text):
+        if self.compiled_registration_initiated.search(text_lower) and not self.has_actual_otp_number(text, text_lower):
             return True
         
         return False
 
-    def has_strong_otp_indicators(self, text: str) -> bool:
+    def has_strong_otp_indicators(self, text: str, text_lower: str = None) -> bool:
         """Check for strong OTP-specific language patterns"""
-        text_lower = text.lower()
-        
-        # Strong OTP-specific phrases
-        strong_otp_phrases = [
-            'is your otp', 'is the otp', 'otp is', 'one time password is',
-            'your otp for', 'otp for your', 'to proceed on', 'otp to login',
-            'otp to register', 'use one time password', 'your one time password'
-        ]
+        if text_lower is None:
+            text_lower = text.lower()
         
-        for phrase in strong_otp_phrases:
+        for phrase in self.strong_otp_phrases:
             if phrase in text_lower:
                 return True
         
         return False
 
-    def has_security_context(self, text: str) -> bool:
+    def has_security_context(self, text: str, text_lower: str = None) -> bool:
         """Check for OTP security warnings"""
-        text_lower = text.lower()
-        
-        # Security context phrases specific to OTP
-        security_phrases = [
-            'do not share', 'never call', 'never message', 'will never call',
-            'never calls you', 'keep your account safe', 'for security reasons',
-            'gives them full access'
-        ]
+        if text_lower is None:
+            text_lower = text.lower()
         
         # Must have security phrase AND OTP number
-        has_security = any(phrase in text_lower for phrase in security_phrases)
-        has_otp_num = self.has_actual_otp_number(text)
+        has_security = any(phrase in text_lower for phrase in self.security_phrases)
+        has_otp_num = self.has_actual_otp_number(text, text_lower)
         
         return has_security and has_otp_num
 
-    def has_validity_context(self, text: str) -> bool:
+    def has_validity_context(self, text: str, text_lower: str = None) -> bool:
         """Check for OTP validity/expiry context"""
-        text_lower = text.lower()
-        
-        validity_patterns = [
-            r'\bvalid\s*for\s*\d+\s*(?:minutes?|mins?)\b',
-            r'\bexpires?\s*in\s*\d+\s*(?:minutes?|mins?)\b',
-            r'\bis\s*valid\s*for\s*\d+\s*(?:minutes?|mins?)\b',
-        ]
+        if text_lower is None:
+            text_lower = text.lower()
         
-        for pattern in validity_patterns:
-            if re.search(pattern, text_lower):
+        for pattern in self.compiled_validity_patterns:
+            if pattern.search(text_lower):
                 return True
         
         return False
 
-    def is_true_otp_message(self, text: str) -> bool:
+    def is_true_otp_message(self, text: str, text_lower: str = None) -> bool:
         """Enhanced method to determine if this is a genuine OTP message"""
+        if text_lower is None:
+            text_lower = text.lower()
         
         # Must have actual OTP number
-        if not self.has_actual_otp_number(text):
+        if not self.has_actual_otp_number(text, text_lower):
             return False
         
         # Check for strong OTP indicators
-        if self.has_strong_otp_indicators(text):
+        if self.has_strong_otp_indicators(text, text_lower):
             return True
         
         # Check for security context
-        if self.has_security_context(text):
+        if self.has_security_context(text, text_lower):
             return True
         
         # Check for validity context with OTP
-        if self.has_validity_context(text) and 'otp' in text.lower():
+        if self.has_validity_context(text, text_lower) and 'otp' in text_lower:
             return True
         
         # Platform-specific patterns
-        text_lower = text.lower()
-        platforms = ['dream11', 'zupee', 'paytm', 'meesho', 'phonepe', 'ajio', 'jio']
-        
-        for platform in platforms:
+        for platform in self.otp_platforms:
             if platform in text_lower:
                 # Check for account/login context
-                if any(word in text_lower for word in ['account', 'login', 'register', 'proceed']):
+                if any(word in text_lower for word in self.platform_account_words):
                     return True
         
         return False
@@ -358,48 +376,44 @@ class SMSClassifier:
         # STEP 1: Quick check - Must have some key terms to continue
         text_lower = combined_text.lower()
         
+        # Every OTP outcome below needs an actual OTP number, so check it once
+        has_otp_num = self.has_actual_otp_number(combined_text, text_lower)
+        
+        # Without an OTP number only the government check can classify the message,
+        # so anything it misses is Unknown regardless of the exclusion steps
+        if not has_otp_num and not self.gov_regex.search(combined_text):
+            return "Unknown"
+        
         # STEP 2: Check for strong banking context FIRST (highest priority exclusion)
-        if self.is_strong_banking_context(combined_text):
+        if self.is_strong_banking_context(combined_text, text_lower):
             return "Unknown"
         
         # STEP 3: Check for promotional content BEFORE other checks
-        if self.is_promotional_message(combined_text):
+        if self.is_promotional_message(combined_text, text_lower):
             return "Unknown"
         
         # STEP 4: Apply banking exclusion patterns (very specific ones)
-        for pattern in self.compiled_banking_exclusions:
-            if pattern.search(combined_text):
-                return "Unknown"
+        if self.banking_exclusion_regex.search(combined_text):
+            return "Unknown"
         
         # STEP 5: Apply promotional exclusion patterns
-        for pattern in self.compiled_promotional_exclusions:
-            if pattern.search(combined_text):
-                return "Unknown"
+        if self.promotional_exclusion_regex.search(combined_text):
+            return "Unknown"
         
         # STEP 6: Check for TRUE OTP messages (this is the main fix)
         # Use comprehensive OTP detection
-        if self.is_true_otp_message(combined_text):
+        if has_otp_num and self.is_true_otp_message(combined_text, text_lower):
             return "Security & Authentication - OTP verification"
         
         # STEP 7: Check using pattern matching for OTP
-        otp_pattern_matches = 0
-        for pattern in self.compiled_true_otp_patterns:
-            if pattern.search(combined_text):
-                otp_pattern_matches += 1
-        
         # If we have strong pattern matches AND actual OTP number, classify as OTP
-        if otp_pattern_matches >= 1 and self.has_actual_otp_number(combined_text):
+        if has_otp_num and self.true_otp_regex.search(combined_text):
             return "Security & Authentication - OTP verification"
         
         # STEP 8: Check for government/identity services (after OTP check)
-        gov_score = 0
-        for pattern in self.compiled_gov_patterns:
-            if pattern.search(combined_text):
-                gov_score += 1
-        
-        if gov_score > 0:
+        if self.gov_regex.search(combined_text):
             # If it has government context AND OTP number, it's an OTP for government service
-            if self.has_actual_otp_number(combined_text):
+            if has_otp_num:
                 return "Security & Authentication - OTP verification"
             else:
                 return "Government & Public Services - Identity services"
@@ -448,30 +462,34 @@ class SMSClassifier:
         print("Starting classification...")
         classification_start = time.time()
         
-        # Process in batches for memory efficiency and progress tracking
-        batch_size = 5000  # Smaller batch for better progress updates
         total_rows = len(new_df)
         
-        for i in range(0, total_rows, batch_size):
-            end_idx = min(i + batch_size, total_rows)
-            
-            # Process batch
-            for idx in range(i, end_idx):
-                message = new_df.at[idx, 'message']
-                sender = new_df.at[idx, 'sender_name'] if pd.notna(new_df.at[idx, 'sender_name']) else ""
-                
-                new_df.at[idx, 'sector'] = self.classify_message(message, sender)
+        # Pull both columns out once instead of a .at lookup per cell, and assign the sectors in one go;
+        # missing cells become "" here rather than being checked per row
+        messages = new_df['message'].fillna("").tolist()
+        senders = new_df['sender_name'].fillna("").tolist()
+        sectors = []
+        # Exports repeat the same messages heavily, so each distinct (message, sender) pair is classified once
+        sector_cache = {}
+        
+        for end_idx, (message, sender) in enumerate(zip(messages, senders), 1):
+            key = (message, sender)
+            sector = sector_cache.get(key)
+            if sector is None:
+                sector = sector_cache[key] = self.classify_message(*key)
+            sectors.append(sector)
             
             # Progress update
-            progress = (end_idx / total_rows) * 100
-            elapsed = time.time() - classification_start
-            rate = end_idx / elapsed if elapsed > 0 else 0
-            remaining_time = (total_rows - end_idx) / rate if rate > 0 else 0
-            
             if (end_idx % 25000 == 0) or (end_idx == total_rows):
+                progress = (end_idx / total_rows) * 100
+                elapsed = time.time() - classification_start
+                rate = end_idx / elapsed if elapsed > 0 else 0
+                remaining_time = (total_rows - end_idx) / rate if rate > 0 else 0
                 print(f"Progress: {progress:.1f}% ({end_idx:,}/{total_rows:,}) | "
                       f"Rate: {rate:.0f} msgs/sec | ETA: {remaining_time/60:.1f} min")
         
+        new_df['sector'] = sectors
+        
         classification_time = time.time() - classification_start
         print(f"\nClassification completed in {classification_time/60:.1f} minutes")
         
@@ -0,0 +1,85 @@
+import random
+import re
+
+import pytest
+
+from enhanced_parsing import EnhancedMessageParser, PatternSet, _required_literal
+
+
+def _loop_matches(pattern_set, text):
+    """Indices of the patterns that match text, searched one at a time"""
+    return [index for index, pattern in enumerate(pattern_set.patterns) if pattern.search(text)]
+
+
+def _assert_same_as_loop(pattern_set, text):
+    expected = _loop_matches(pattern_set, text)
+    assert pattern_set.count_matches(text) == len(expected), text
+    assert pattern_set.matches_any(text) == bool(expected), text
+    assert pattern_set.first_match(text) == (expected[0] if expected else None), text
+
+
+def _parser_pattern_sets():
+    """(name, PatternSet) for every pattern set the parser builds, including the per-status ones"""
+    parser = EnhancedMessageParser()
+    for name, value in vars(parser).items():
+        if isinstance(value, PatternSet):
+            yield name, value
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if isinstance(item, PatternSet):
+                    yield f'{name}[{key}]', item
+
+
+PARSER_PATTERN_SETS = list(_parser_pattern_sets())
+
+
+def _sample_texts(pattern_set, count=300):
+    """Messages built from phrases in the set's patterns, with case, Unicode folding and separator variants"""
+    # Phrases lifted from the pattern sources, so patterns without a single required literal get hits too
+    sources = [re.sub(r'\\[a-zA-Z][*+?]?', ' ', pattern.pattern) for pattern in pattern_set.patterns]
+    words = sorted({phrase for source in sources for phrase in re.findall(r'[a-z][a-z ]*[a-z]', source)})
+    words += ['123456', 'rs. 500', 'your', 'is', 'the', 'for', 'otp', 'Do not share', 'ü', '-']
+    rng = random.Random(len(pattern_set))
+    texts = []
+    for _ in range(count):
+        text = ' '.join(rng.choice(words) for _ in range(rng.randint(1, 6)))
+        variant = rng.randrange(6)
+        if variant == 1:
+            text = text.upper()
+        elif variant == 2:
+            # ſ and the Kelvin sign fold to s and k under IGNORECASE but are not ASCII
+            text = text.replace('s', 'ſ').replace('k', 'K')
+        elif variant == 3:
+            text = text.replace(' ', rng.choice('\x1c\x1d\x1e\x1f'))
+        elif variant == 4:
+            text = f'{text} {text.title()}'
+        texts.append(text)
+    return texts
+
+
+@pytest.mark.parametrize('name, pattern_set', PARSER_PATTERN_SETS, ids=[name for name, _ in PARSER_PATTERN_SETS])
+def test_parser_pattern_sets_match_like_a_plain_search(name, pattern_set):
+    for text in _sample_texts(pattern_set):
+        _assert_same_as_loop(pattern_set, text)
+
+
+def test_ascii_separators_match_like_a_plain_search():
+    # re's \s matches \x1c-\x1f but Hyperscan's does not, so these must not take the Hyperscan path
+    pattern_set = PatternSet([r'\bdo\s+not\s+share\b'])
+    for separator in '\x1c\x1d\x1e\x1f':
+        _assert_same_as_loop(pattern_set, f'do{separator}not share')
+
+
+def test_case_folding_of_non_ascii_letters():
+    pattern_set = PatternSet([r'\bshare\b', r'\bkotak\b'])
+    for text in ['do not ſhare', 'Kotak bank', 'SHARE', 'ſK', 'kotak']:
+        _assert_same_as_loop(pattern_set, text)
+
+
+def test_patterns_without_a_required_literal():
+    patterns = [r'\b\d{4,8}\b', r'(?:otp|code)\s*is', r'rs\.?\s*\d+', r'\bvalid\s+for\b']
+    assert [_required_literal(p) for p in patterns] == ['', '', '', 'valid']
+    for fuse in (False, True):
+        pattern_set = PatternSet(patterns, fuse=fuse)
+        for text in ['123456', 'Code is', 'Rs. 500', 'VALID FOR 10 min', 'valid\x1ffor', 'nothing here', '']:
+            _assert_same_as_loop(pattern_set, text)